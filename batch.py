@@ -0,0 +1,96 @@
+"""Concurrent batch ingestion of many job posting URLs."""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import job_index
+import processor
+import scraper
+import timings
+
+
+def available_cpus():
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def read_urls(stream):
+    seen = set()
+    for line in stream:
+        url = line.strip()
+        if url and not url.startswith("#") and url not in seen:
+            seen.add(url)
+            yield url
+
+
+def _parse_traced(html, url, memory):
+    # Worker processes record their own spans and ship them back with the result.
+    timings.enable(memory)
+    try:
+        job = scraper.extract_job(html, url)
+    finally:
+        spans = timings.disable()
+    for s in spans:
+        s["thread"] = f"pid-{os.getpid()}"
+    return job, spans
+
+
+def _failure(url, stage, exc):
+    if isinstance(exc, job_index.Duplicate):
+        return {"url": url, "ok": True, "skipped": exc.reason, "folder": exc.folder}
+    return {"url": url, "ok": False, "stage": stage, "error": str(exc) or type(exc).__name__}
+
+
+def run_batch(urls, base_dir, french=False, workers=16, procs=None, cache=None, session=None, index=None, manifest=None,
+              sink=None, fill=False):
+    # Fetch on threads, parse on processes; folder writes stay on this thread
+    # so postings mapping to the same folder name never race.
+    urls = list(urls)
+    results = {}
+    procs = procs or os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as fetch_pool, ProcessPoolExecutor(max_workers=procs) as parse_pool:
+        pending = {fetch_pool.submit(scraper.fetch_html, url, cache, session, index): ("fetch", url) for url in urls}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, url = pending.pop(fut)
+                try:
+                    value = fut.result()
+                except Exception as e:
+                    if cache and isinstance(e, scraper.Blocked):
+                        # fetch_html cached the challenge page before it was parsed.
+                        cache.discard(url)
+                    results[url] = _failure(url, stage, e)
+                    continue
+
+                if stage == "fetch":
+                    if timings.enabled():
+                        fut = parse_pool.submit(_parse_traced, value, url, timings.memory_enabled())
+                    else:
+                        fut = parse_pool.submit(scraper.extract_job, value, url)
+                    pending[fut] = ("parse", url)
+                    continue
+
+                if timings.enabled():
+                    value, spans = value
+                    timings.merge(spans)
+
+                try:
+                    out = processor.process_job(value, base_dir, url, french=french, index=index, manifest=manifest,
+                                                sink=sink, fill=fill)
+                except Exception as e:
+                    results[url] = _failure(url, "write", e)
+                    continue
+                results[url] = {"url": url, "ok": True, "folder": str(out["folder_path"])}
+
+    return [results[url] for url in urls]
+
+
+def write_summary(results, stream):
+    for r in results:
+        stream.write(json.dumps(r, ensure_ascii=False) + "\n")
+    stream.flush()
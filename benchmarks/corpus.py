@@ -0,0 +1,119 @@
+"""Deterministic synthetic job posting pages for offline benchmarks."""
+
+import json
+import random
+from pathlib import Path
+
+KINDS = ("jsonld", "indeed", "linkedin")
+SIZES = (50_000, 500_000, 5_000_000)
+
+_WORDS = (
+    "platform engineer build operate services python rust kubernetes cloud data pipelines "
+    "latency reliability team customers product design review mentor observability security "
+    "scale distributed systems api backend frontend testing deploy ownership impact"
+).split()
+
+
+def _sentence(rnd, n=14):
+    return " ".join(rnd.choice(_WORDS) for _ in range(n)).capitalize() + "."
+
+
+def description_html(rnd, size):
+    parts, total = [], 0
+    while total < size:
+        if rnd.random() < 0.3:
+            block = "<ul>" + "".join(f"<li>{_sentence(rnd, 8)}</li>" for _ in range(5)) + "</ul>"
+        else:
+            block = f"<p>{_sentence(rnd)} {_sentence(rnd)} {_sentence(rnd)}</p>"
+        parts.append(block)
+        total += len(block)
+    return "".join(parts)
+
+
+def _bundle(rnd, size):
+    # Minified-looking inline JS: the expensive, irrelevant bulk of real pages.
+    state = {f"k{i}": "".join(rnd.choice("abcdefghijklmnop") for _ in range(40)) for i in range(max(1, size // 60))}
+    return f"<script>window.__INITIAL_STATE__={json.dumps(state)};</script>"
+
+
+def _filler(rnd, size):
+    parts, total = [], 0
+    while total < size:
+        if rnd.random() < 0.5:
+            block = _bundle(rnd, min(size - total, 200_000))
+        else:
+            block = "".join(
+                f'<div class="card c{rnd.randrange(99)}"><span>{_sentence(rnd, 6)}</span><a href="/j/{rnd.randrange(10**6)}">more</a></div>'
+                for _ in range(20)
+            )
+        parts.append(block)
+        total += len(block)
+    return "".join(parts)
+
+
+def _title_company(rnd):
+    level = rnd.choice(("Senior", "Staff", "Lead"))
+    title = f"{level} {rnd.choice(('Platform', 'Backend', 'Data', 'Site Reliability'))} Engineer"
+    company = rnd.choice(("Northwind Analytics Inc.", "Contoso Cloud Ltd", "Fabrikam Robotics", "Tailspin Health"))
+    return title, company
+
+
+def jsonld_page(size, seed=0):
+    rnd = random.Random(seed)
+    title, company = _title_company(rnd)
+    desc = description_html(rnd, min(size // 10, 40_000))
+    posting = {"@context": "https://schema.org", "@graph": [
+        {"@type": "Organization", "name": company},
+        {"@type": "JobPosting", "title": title, "hiringOrganization": {"@type": "Organization", "name": company},
+         "description": desc},
+    ]}
+    head = f'<title>{title}</title><script type="application/ld+json">{json.dumps(posting)}</script>'
+    body = _filler(rnd, size - len(head))
+    return f"<!DOCTYPE html><html><head>{head}</head><body>{body}</body></html>"
+
+
+def indeed_page(size, seed=0):
+    rnd = random.Random(seed)
+    title, company = _title_company(rnd)
+    desc = description_html(rnd, min(size // 10, 40_000))
+    main = (
+        f'<meta property="og:title" content="{title} - {company}">'
+        f'<h1 class="jobsearch-JobInfoHeader-title"><span>{title}</span></h1>'
+        f'<div data-testid="inlineHeader-companyName"><a href="/cmp/x">{company}</a></div>'
+        f'<div id="jobDescriptionText" class="jobsearch-jobDescriptionText">{desc}</div>'
+    )
+    half = (size - len(main)) // 2
+    return f"<!DOCTYPE html><html><head></head><body>{_filler(rnd, half)}{main}{_filler(rnd, half)}</body></html>"
+
+
+def linkedin_page(size, seed=0):
+    rnd = random.Random(seed)
+    title, company = _title_company(rnd)
+    desc = description_html(rnd, min(size // 10, 40_000))
+    head = (
+        f'<meta property="og:title" content="{company} hiring {title} in Montreal, QC | LinkedIn">'
+        f'<meta property="og:description" content="{_sentence(rnd)}">'
+    )
+    main = (
+        f'<a class="topcard__org-name-link" href="/company/x">{company}</a>'
+        f'<div class="show-more-less-html__markup relative">{desc}</div>'
+    )
+    body = _filler(rnd, size - len(head) - len(main))
+    return f"<!DOCTYPE html><html><head>{head}</head><body>{main}{body}</body></html>"
+
+
+PAGES = {"jsonld": jsonld_page, "indeed": indeed_page, "linkedin": linkedin_page}
+
+
+def build(directory, sizes=SIZES, seed=0):
+    """Write every kind at every size to DIRECTORY (reused if already there)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    out = []
+    for kind in KINDS:
+        for size in sizes:
+            path = directory / f"{kind}-{size}-{seed}.html"
+            if not path.exists():
+                path.write_text(PAGES[kind](size, seed), encoding="utf-8")
+            out.append((kind, size, path))
+    return out
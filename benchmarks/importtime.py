@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Cold-start import budget per job_tool.py route, measured with -X importtime.
+
+Each route runs job_tool.py with inputs that stop right after its imports
+(a missing .tex, an offline cache miss, an empty batch, an empty folder tree)
+so nothing touches the network. The runs get a temporary JOB_TOOL_CACHE, so
+the repo's own .cache is left alone. Exits 1 when a route goes over budget
+or the .tex route loads the scraping stack.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+JOB_TOOL = ROOT / "job_tool.py"
+
+# Milliseconds of imports beyond a bare interpreter, best of --repeat runs.
+BUDGETS = {"tex": 60, "url": 160, "batch": 190, "build-all": 80}
+TEX_FORBIDDEN = ("scraper", "processor", "http.client", "urllib.request", "html.parser", "batch")
+
+
+def _routes(tmp):
+    urls = Path(tmp) / "urls.txt"
+    urls.write_text("", encoding="utf-8")
+    return {
+        "tex": [str(Path(tmp) / "missing.tex")],
+        "url": ["--offline", "https://example.invalid/posting"],
+        "batch": ["--offline", "--batch", str(urls), "--summary", os.devnull],
+        "build-all": ["build-all", tmp],
+    }
+
+
+def _imports(args, cwd, env=None):
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd, env=env, capture_output=True,
+                          text=True)
+    mods = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            mods[name.rstrip()[1:]] = int(cumulative)
+    return mods
+
+
+def _top_level_ms(mods, baseline):
+    # Top-level entries (no indentation) carry the cumulative cost of everything under them.
+    return sum(us for name, us in mods.items() if not name.startswith(" ") and name not in baseline) / 1000
+
+
+def check(repeat=5, scale=1.0, report=None):
+    """Failure messages for every route over budget (empty when all pass); REPORT gets one row per route."""
+    baseline = set(_imports(["-c", "pass"], ROOT))
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, JOB_TOOL_CACHE=str(Path(tmp) / "cache"))
+        for route, argv in _routes(tmp).items():
+            runs = [_imports([str(JOB_TOOL), *argv], tmp, env) for _ in range(repeat)]
+            ms = min(_top_level_ms(m, baseline) for m in runs)
+            budget = BUDGETS[route] * scale
+            if report:
+                report(route, ms, budget)
+            if ms > budget:
+                failures.append(f"{route}: {ms:.1f} ms of imports, budget {budget:.0f} ms")
+            if route == "tex":
+                loaded = {n.strip() for n in runs[0]}
+                failures.extend(f"tex: imports {m}" for m in TEX_FORBIDDEN if m in loaded)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per route (best is kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. for slow CI machines")
+    args = parser.parse_args()
+
+    print(f"{'route':10} {'imports ms':>10} {'budget':>8}")
+    failures = check(args.repeat, args.scale,
+                     lambda route, ms, budget: print(f"{route:10} {ms:10.1f} {budget:8.0f}"))
+    for f in failures:
+        print(f"OVER BUDGET {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark the regex JSON-LD fast path against full HTML tokenization."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scraper  # noqa: E402
+
+_POSTING = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {"@type": "Organization", "name": "Example Corp"},
+        {
+            "@type": "JobPosting",
+            "title": "Senior Platform Engineer",
+            "hiringOrganization": {"@type": "Organization", "name": "Example Corp"},
+            "description": "<p>Build and run services.</p><ul><li>Python</li><li>Kubernetes</li></ul>",
+        },
+    ],
+}
+
+
+def make_page(size, ld_at_end=False):
+    ld = f'<script type="application/ld+json">{json.dumps(_POSTING)}</script>'
+    bundle = "<script>window.__STATE__=" + json.dumps({"k": "v" * 64}) + ";" * 32 + "</script>"
+    block = '<div class="card"><span>Filler text for layout</span><a href="/x">link</a></div>' + bundle
+    body = block * max(1, size // len(block))
+    head = "" if ld_at_end else ld
+    tail = ld if ld_at_end else ""
+    return f"<html><head>{head}<title>Job</title></head><body>{body}{tail}</body></html>"
+
+
+def _tokenized(html):
+    return scraper._job_from_scripts(scraper._scan(html, meta=False, indeed=False).scripts)
+
+
+def _best(fn, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100000,1000000,3000000", help="Comma-separated page sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>9} {'ld+json':>7} {'tokenize':>10} {'fast':>10} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for at_end in (False, True):
+            html = make_page(size, at_end)
+            assert scraper.parse_json_ld(html) == _tokenized(html)
+            slow = _best(_tokenized, html, args.repeat)
+            fast = _best(scraper.parse_json_ld, html, args.repeat)
+            where = "end" if at_end else "head"
+            print(f"{len(html):>9} {where:>7} {slow * 1000:>8.1f}ms {fast * 1000:>8.2f}ms {slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Time resume ranking over synthetic job folders.
+
+Run: python benchmarks/rank.py [--folders 100000] [--python]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import ranking  # noqa: E402
+from search import make_tree  # noqa: E402
+
+RESUME = "Senior platform engineer: python, rust, kubernetes, terraform and postgres; distributed systems and observability."
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=100_000)
+    parser.add_argument("--python", action="store_true", help="Time the pure-Python scorer instead of NumPy")
+    args = parser.parse_args()
+    if args.python:
+        ranking.np = None
+    print(f"scorer: {'numpy' if ranking.np is not None else 'python'}")
+
+    with tempfile.TemporaryDirectory() as root:
+        t0 = time.perf_counter()
+        make_tree(root, args.folders)
+        print(f"generated {args.folders} folders in {time.perf_counter() - t0:.1f} s")
+
+        with ranking.RankIndex(root) as index:
+            t0 = time.perf_counter()
+            counts = index.refresh()
+            print(f"full build      {(time.perf_counter() - t0) * 1000:9.0f} ms  {counts}")
+            t0 = time.perf_counter()
+            counts = index.refresh()
+            print(f"no-op refresh   {(time.perf_counter() - t0) * 1000:9.0f} ms  {counts}")
+            best = float("inf")
+            for _ in range(3):
+                t0 = time.perf_counter()
+                hits = index.rank(RESUME)
+                best = min(best, time.perf_counter() - t0)
+            print(f"rank            {best * 1000:9.0f} ms  top: {hits[0][0].name} {hits[0][1]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Memory of 100k postings held as dicts versus JobPosting, and the cost of saving and loading them.
+
+Run: python benchmarks/records.py [--records 100000] [--companies 2000] [--sentences 8]
+
+Every variant decodes its own copy of the raw text, as parsing a page would,
+so no strings are shared between variants. Memory is what tracemalloc sees
+retained once the list is built.
+"""
+
+import argparse
+import gc
+import json
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import job_index  # noqa: E402
+import job_posting  # noqa: E402
+from corpus import _sentence  # noqa: E402
+from http_cache import canonical_url  # noqa: E402
+
+
+def make_raw(n, companies, sentences, seed=0):
+    rnd = random.Random(seed)
+    names = [f"{rnd.choice(('Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli'))} {i} Inc" for i in range(companies)]
+    raw = []
+    for i in range(n):
+        url = (f"https://ca.indeed.com/viewjob?jk={i:016x}&from=serp" if i % 2
+               else f"https://careers.example.com/jobs/{i}?utm_source=x")
+        desc = "\n\n".join(" ".join(_sentence(rnd) for _ in range(2)) for _ in range(sentences // 2))
+        job = {"title": f"Engineer {i % 500}", "company": rnd.choice(names), "description": desc}
+        # Hashed here, outside the measured builds; each build copies the hex string.
+        raw.append((*(job[k].encode() for k in ("title", "company", "description")), url.encode(),
+                    job_index.hash_fields(job).encode()))
+    return raw
+
+
+def _canonical(url):
+    sid = job_index.site_job_id(url)
+    return f"{sid[0]}:{sid[1]}" if sid else canonical_url(url)
+
+
+def parser_dicts(raw):
+    return [{"title": t.decode(), "company": c.decode(), "description": d.decode()} for t, c, d, _, _ in raw]
+
+
+def full_dicts(raw):
+    out = []
+    for t, c, d, u, h in raw:
+        job = {"title": t.decode(), "company": c.decode(), "description": d.decode(), "url": u.decode()}
+        job["canonical_id"] = _canonical(job["url"])
+        job["content_hash"] = h.decode()
+        out.append(job)
+    return out
+
+
+def postings(raw):
+    out = []
+    for t, c, d, u, h in raw:
+        p = job_posting.JobPosting(t.decode(), c.decode(), d.decode(), u.decode(), bytes.fromhex(h.decode()))
+        p.canonical_id  # noqa: B018 -- computed and kept, like the dict variant
+        out.append(p)
+    return out
+
+
+def measure(label, build, raw):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    records = build(raw)
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    desc = sum(sys.getsizeof(r["description"]) for r in records)
+    print(f"{label:28} {size / 2**20:8.1f} MB  {(size - desc) / len(raw):6.0f} B/record besides the description"
+          f"  build {elapsed:5.2f} s")
+    return records, size
+
+
+def timed(label, fn):
+    t0 = time.perf_counter()
+    out = fn()
+    print(f"  {label:26} {(time.perf_counter() - t0) * 1000:8.0f} ms")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, default=8, help="Description length in sentences (~100 chars each)")
+    args = parser.parse_args()
+    raw = make_raw(args.records, args.companies, args.sentences)
+    print(f"{args.records} records, {args.companies} companies, "
+          f"{sum(len(r[2]) for r in raw) / len(raw):.0f}-byte descriptions\n")
+
+    measure("dicts (parser fields)", parser_dicts, raw)
+    dicts, dict_size = measure("dicts (all six fields)", full_dicts, raw)
+    records, rec_size = measure("JobPosting (all six fields)", postings, raw)
+    print(f"\nJobPosting uses {rec_size / dict_size:.0%} of the six-field dicts' memory "
+          f"({(dict_size - rec_size) / 2**20:.1f} MB less)\n")
+
+    blob = timed("pickle dumps (JobPosting)", lambda: pickle.dumps(records, pickle.HIGHEST_PROTOCOL))
+    back = timed("pickle loads (JobPosting)", lambda: pickle.loads(blob))
+    if back != records:
+        raise SystemExit("round trip changed the postings")
+    pickled = timed("pickle dumps (dicts)", lambda: pickle.dumps(dicts, pickle.HIGHEST_PROTOCOL))
+    timed("pickle loads (dicts)", lambda: pickle.loads(pickled))
+    lines = timed("JSON lines dumps (dicts)", lambda: "\n".join(json.dumps(d) for d in dicts).encode())
+    timed("JSON lines loads (dicts)", lambda: [json.loads(line) for line in lines.splitlines()])
+    print(f"\nsizes: pickle of JobPosting {len(blob) / 2**20:.1f} MB, pickle of dicts {len(pickled) / 2**20:.1f} MB, "
+          f"JSON lines {len(lines) / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
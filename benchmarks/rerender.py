@@ -0,0 +1,70 @@
+"""Time rerender over job folders made by process_job: a no-op pass and a pass where every prompt is stale.
+
+Run: python benchmarks/rerender.py [--folders 20000] [-j N] [--manifest]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import layout  # noqa: E402
+import processor  # noqa: E402
+import rerender  # noqa: E402
+from corpus import _sentence  # noqa: E402
+
+_COMPANIES = ("Acme Corp", "Société Générale", "AT&T", "Globex  International\tLtd", "O'Reilly Media")
+
+
+def make_tree(root, n, manifest=False, seed=0):
+    rnd = random.Random(seed)
+    m = layout.Manifest(root, "company") if manifest else None
+    for i in range(n):
+        job = {"title": f"Engineer {i}", "company": f"{_COMPANIES[i % len(_COMPANIES)]} {i % 997}",
+               "description": "\n\n".join(" ".join(_sentence(rnd) for _ in range(4)) for _ in range(6))}
+        processor.process_job(job, root, f"https://example.com/jobs/{i}", french=i % 10 == 0, manifest=m)
+
+
+def timed(root, jobs, expect):
+    t0 = time.perf_counter()
+    results = rerender.rerender(root, workers=jobs)
+    elapsed = time.perf_counter() - t0
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    print(f"  {elapsed * 1000:8.0f} ms  {len(results) / elapsed:8.0f} folders/s  {counts}")
+    if counts != expect:
+        raise SystemExit(f"expected {expect}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=20000)
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--manifest", action="store_true", help="Lay folders out with a manifest (title and company known)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        make_tree(root, args.folders, args.manifest)
+        prompts = sorted(root.glob("**/prompt*.txt"))
+        mtimes = [p.stat().st_mtime_ns for p in prompts]
+        print("nothing changed")
+        timed(root, args.jobs, {"current": args.folders})
+        if [p.stat().st_mtime_ns for p in prompts] != mtimes:
+            raise SystemExit("a no-op pass touched files")
+        for p in prompts[::2]:
+            with open(p, "a", encoding="utf-8") as f:
+                f.write("stale\n")
+        print("every folder stale")
+        timed(root, args.jobs, {"updated": args.folders})
+        print("again, nothing changed")
+        timed(root, args.jobs, {"current": args.folders})
+
+
+if __name__ == "__main__":
+    main()
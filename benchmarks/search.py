@@ -0,0 +1,85 @@
+"""Build a search index over synthetic job folders and time queries and refreshes.
+
+Run: python benchmarks/search.py [--folders 50000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import search_index  # noqa: E402
+from corpus import _WORDS  # noqa: E402
+
+QUERIES = (
+    "kubernetes",
+    "rust python",
+    '"distributed systems"',
+    "(rust OR golang) -java",
+    "observ*",
+    "staff platform engineer montreal",
+)
+_EXTRA = ("golang", "java", "montreal", "toronto", "remote", "staff", "senior", "junior", "terraform", "postgres")
+
+
+def make_tree(root, n, seed=0):
+    rnd = random.Random(seed)
+    vocab = list(_WORDS) + [f"term{i}" for i in range(5000)]
+    weights = [1.0 / (i + 1) for i in range(len(vocab))]
+    for i in range(n):
+        name = f"Job-{i:06d}-Company-{i % 997}"
+        folder = Path(root) / name
+        folder.mkdir()
+        words = rnd.choices(vocab, weights, k=400) + rnd.sample(_EXTRA, 3)
+        body = "\n".join(" ".join(words[j:j + 12]) for j in range(0, len(words), 12))
+        (folder / f"{name}.txt").write_text(f"Source: https://example.com/jobs/{i}\n\n{body}\n", encoding="utf-8")
+
+
+def _ms(fn, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folders", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        t0 = time.perf_counter()
+        make_tree(root, args.folders)
+        print(f"generated {args.folders} folders in {time.perf_counter() - t0:.1f} s")
+
+        with search_index.SearchIndex(root) as index:
+            ms, counts = _ms(index.refresh)
+            print(f"full build      {ms:9.0f} ms  {counts}")
+            ms, counts = _ms(index.refresh)
+            print(f"no-op refresh   {ms:9.0f} ms  {counts}")
+
+            names = sorted(n for n in os.listdir(root) if n.startswith("Job-"))[:100]
+            for name in names:
+                with open(Path(root, name, f"{name}.txt"), "a", encoding="utf-8") as f:
+                    f.write("terraform postgres\n")
+            ms, counts = _ms(index.refresh)
+            print(f"100 changed     {ms:9.0f} ms  {counts}")
+
+            times = []
+            for q in QUERIES:
+                ms, hits = _ms(lambda: index.search(q), repeat=5)
+                times.append(ms)
+                print(f"query {q!r:36} {ms:7.1f} ms  {len(hits)} hits")
+            print(f"median query    {statistics.median(times):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Time process_job writing N bundles to folders, a .zip, a .tar and SQLite.
+
+Run: python benchmarks/sinks.py [--bundles 5000] [--dir PATH]
+
+Use --dir to point at the filesystem you care about (e.g. a network mount);
+the small-file cost of the folder sink is what the other sinks avoid.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import processor  # noqa: E402
+import sinks  # noqa: E402
+from corpus import _sentence  # noqa: E402
+
+
+def jobs(n, seed=0):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield {"title": f"Engineer {i}", "company": f"Company {i % 500}",
+               "description": "\n\n".join(" ".join(_sentence(rnd) for _ in range(4)) for _ in range(6))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bundles", type=int, default=5000)
+    parser.add_argument("--dir", help="Where to write (default: a temporary folder)")
+    args = parser.parse_args()
+    postings = list(jobs(args.bundles))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as root:
+        root = Path(root)
+        for label, make in (("folders", lambda: sinks.DirSink(root / "dirs")),
+                            ("zip", lambda: sinks.open_sink(root / "out.zip")),
+                            ("tar", lambda: sinks.open_sink(root / "out.tar")),
+                            ("sqlite", lambda: sinks.open_sink(root / "out.sqlite"))):
+            t0 = time.perf_counter()
+            with make() as sink:
+                for job in postings:
+                    processor.process_job(job, root / "dirs", f"https://example.com/{job['title']}", sink=sink)
+            elapsed = time.perf_counter() - t0
+            print(f"{label:8} {elapsed * 1000:8.0f} ms  {args.bundles / elapsed:8.0f} bundles/s")
+
+
+if __name__ == "__main__":
+    main()
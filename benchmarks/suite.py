@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Stage-by-stage benchmark over a synthetic corpus, with baseline regression checks."""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import corpus  # noqa: E402
+import file_ops  # noqa: E402
+import processor  # noqa: E402
+import scraper  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE / "baseline.json"
+DEFAULT_CORPUS = HERE.parent / ".cache" / "bench-corpus"
+
+
+def _cases(pages, tmp):
+    """Yield (name, fn, bytes_processed, ops) for every stage and input size."""
+    for kind, size, path in pages:
+        html = path.read_text(encoding="utf-8")
+        n = len(html.encode("utf-8"))
+        if kind == "jsonld":
+            yield f"parse_json_ld/{size}", lambda h=html: scraper.parse_json_ld(h), n, 1
+        if kind == "indeed":
+            yield f"parse_indeed/{size}", lambda h=html: scraper.parse_indeed(h), n, 1
+        if kind == "linkedin":
+            yield f"parse_linkedin/{size}", lambda h=html: scraper.parse_linkedin(h), n, 1
+        yield f"scrape_job/{kind}/{size}", lambda p=str(path): scraper.scrape_job(p), n, 1
+
+    rnd = random.Random(0)
+    desc_html = corpus.description_html(rnd, 40_000)
+    yield "_strip_html/40k", lambda: scraper._strip_html(desc_html), len(desc_html), 1
+
+    pairs = [(f"{corpus._title_company(rnd)[0]} {i}", corpus._title_company(rnd)[1]) for i in range(2000)]
+    yield "make_folder_name/2000", lambda: [processor.make_folder_name(t, c) for t, c in pairs], 0, len(pairs)
+
+    desc = scraper._strip_html(desc_html)
+    prompt = "Edit resume-template.tex only using the following guidelines:\n" + corpus._sentence(rnd, 60)
+    folder = Path(tmp)
+    yield "write_prompt_file/40k", lambda: file_ops.write_prompt_file(folder, "prompt.txt", prompt, desc), len(desc), 1
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def _peak(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, repeat, corpus_dir, only=None):
+    pages = corpus.build(corpus_dir, sizes)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn, nbytes, ops in _cases(pages, tmp):
+            if only and not any(o in name for o in only):
+                continue
+            secs = _time(fn, repeat)
+            r = {"seconds": secs, "peak_bytes": _peak(fn)}
+            if nbytes:
+                r["mb_per_s"] = nbytes / secs / 1e6
+            if ops > 1:
+                r["ops_per_s"] = ops / secs
+            results[name] = r
+            rate = f"{r['mb_per_s']:8.1f} MB/s" if "mb_per_s" in r else f"{r.get('ops_per_s', 1 / secs):8.0f} op/s"
+            print(f"{name:32} {secs * 1000:10.2f} ms  {rate}  peak {r['peak_bytes'] / 1024:10.0f} KiB", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in ("seconds", "peak_bytes"):
+            if base.get(key) and r[key] > base[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {base[key]:.4g} -> {r[key]:.4g} (+{r[key] / base[key] - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default=",".join(map(str, corpus.SIZES)), help="Comma-separated page sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (best is kept)")
+    parser.add_argument("--only", action="append", help="Run only cases whose name contains this (repeatable)")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Where generated pages are kept")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown/memory growth before flagging")
+    args = parser.parse_args()
+
+    results = run([int(s) for s in args.sizes.split(",")], args.repeat, args.corpus, args.only)
+
+    if args.save_baseline:
+        meta = {"python": platform.python_version(), "machine": platform.machine(), "saved": time.time()}
+        args.baseline.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline to compare against; run with --save-baseline first.")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
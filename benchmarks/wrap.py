@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark description wrapping: per-file textwrap passes against wrap-once."""
+
+import argparse
+import random
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import corpus  # noqa: E402
+import file_ops  # noqa: E402
+import processor  # noqa: E402
+import prompt_creator  # noqa: E402
+import scraper  # noqa: E402
+
+
+def _textwrap(text, width=80):
+    # The wrapper process_job used before: textwrap.fill on every line.
+    lines = []
+    for raw in (text or "").splitlines():
+        ln = raw.strip()
+        if not ln:
+            lines.append("")
+        else:
+            lines.extend(textwrap.fill(ln, width, break_long_words=False, break_on_hyphens=False).splitlines())
+    return "\n".join(lines)
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="20000,40000,200000", help="Comma-separated description sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'textwrap x3':>12} {'wrap x1':>10} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        desc = scraper._strip_html(corpus.description_html(random.Random(size), size))
+        if file_ops.wrap(desc) != _textwrap(desc):
+            raise SystemExit(f"output differs from textwrap at size {size}")
+        prompts = processor.render_prompts(file_ops.wrap(desc))
+        for name, template in (("prompt.txt", prompt_creator.get_main_prompt()),
+                               ("prompt-cover.txt", prompt_creator.get_cover_prompt())):
+            if prompts[name] != f"{_textwrap(template).rstrip()}\n\n{_textwrap(desc).rstrip()}\n":
+                raise SystemExit(f"{name} differs from the textwrap output at size {size}")
+        # process_job used to wrap the description for the .txt and both prompts.
+        old = _best(lambda: [_textwrap(desc) for _ in range(3)], args.repeat)
+        new = _best(lambda: file_ops.wrap(desc), args.repeat)
+        print(f"{len(desc):8} {old * 1000:10.2f}ms {new * 1000:8.2f}ms {old / new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,99 @@
 """File operations for job folder creation."""
 
+import os
+import re
 import shutil
 import textwrap
+import threading
 from pathlib import Path
 
+import timings
 
+# A word made only of non-space whitespace (lone NBSP, \x1f); textwrap drops it at line edges.
+_BLANK_WORD_RE = re.compile(r"(?:^| )[^\S ]+(?= |$)")
+
+
+@timings.timed("ensure_job_folder")
 def ensure_job_folder(base_dir, folder_name):
     path = Path(base_dir) / folder_name
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-def _wrap(text, width=80):
-    lines = []
-    for raw in (text or "").splitlines():
-        ln = raw.strip()
-        if not ln:
-            lines.append("")
-        else:
-            lines.extend(textwrap.fill(ln, width, break_long_words=False, break_on_hyphens=False).splitlines())
-    return "\n".join(lines)
+def _fill(line, width):
+    # Same result as textwrap.fill(line, width, break_long_words=False,
+    # break_on_hyphens=False) for a stripped line. Single-spaced text is cut
+    # at the last space that fits; anything else goes through textwrap.
+    if "\t" in line:
+        line = line.expandtabs()
+    if len(line) <= width:
+        return line
+    if "  " in line or ((not line.isascii() or "\x1f" in line) and _BLANK_WORD_RE.search(line)):
+        return textwrap.fill(line, width, break_long_words=False, break_on_hyphens=False)
+    out, pos, end = [], 0, len(line)
+    while end - pos > width:
+        cut = line.rfind(" ", pos, pos + width + 1)
+        if cut < 0:
+            # A word longer than the width gets a line to itself.
+            cut = line.find(" ", pos + width)
+            if cut < 0:
+                break
+        out.append(line[pos:cut])
+        pos = cut + 1
+    out.append(line[pos:])
+    return "\n".join(out)
 
 
-def write_description(folder, filename, description, width=80, source_url=None):
-    path = folder / filename
+def wrap(text, width=80):
+    return "\n".join(_fill(ln, width) if (ln := raw.strip()) else "" for raw in (text or "").splitlines())
+
+
+def description_text(description, width=80, source_url=None, prewrapped=False):
     parts = []
     if source_url:
         parts.extend([f"Source: {source_url.strip()}", ""])
-    if text := _wrap(description, width).rstrip():
+    if text := (description if prewrapped else wrap(description, width)).rstrip():
         parts.append(text)
-    path.write_text("\n".join(parts).rstrip() + "\n", encoding="utf-8")
-    return path
+    return "\n".join(parts).rstrip() + "\n"
+
+
+def prompt_text(prompt, description, width=80, prewrapped=False):
+    """PROMPT then DESCRIPTION; with PREWRAPPED both are taken as already wrapped to WIDTH."""
+    if not prewrapped:
+        prompt, description = wrap(prompt, width), wrap(description, width)
+    parts = [p for p in [prompt.rstrip(), description.rstrip()] if p]
+    return "\n\n".join(parts).rstrip() + "\n"
 
 
-def write_prompt_file(folder, filename, prompt, description, width=80):
+@timings.timed("write_file")
+def write_text(folder, filename, text):
     path = folder / filename
-    parts = [p for p in [_wrap(prompt, width).rstrip(), _wrap(description, width).rstrip()] if p]
-    path.write_text("\n\n".join(parts).rstrip() + "\n", encoding="utf-8")
+    path.write_text(text, encoding="utf-8")
     return path
 
 
+@timings.timed("replace_file")
+def replace_text(path, text):
+    """Write TEXT over PATH through a temporary file, so readers see the old or new file, never half of one."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def write_description(folder, filename, description, width=80, source_url=None, prewrapped=False):
+    return write_text(folder, filename, description_text(description, width, source_url, prewrapped))
+
+
+def write_prompt_file(folder, filename, prompt, description, width=80, prewrapped=False):
+    return write_text(folder, filename, prompt_text(prompt, description, width, prewrapped))
+
+
+@timings.timed("copy_template")
 def copy_template(template_path, target_dir, target_name=None):
     if not template_path.exists():
         return None
@@ -0,0 +1,169 @@
+"""On-disk HTTP response cache keyed by canonicalized URL."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# The HTTP cache, index and page archive all live here; JOB_TOOL_CACHE moves them.
+CACHE_ROOT = Path(os.environ.get("JOB_TOOL_CACHE") or Path(__file__).parent / ".cache")
+CACHE_DIR = CACHE_ROOT / "http"
+
+_TRACKING = {
+    "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmkt", "igshid",
+    "refid", "trackingid", "trk", "trkinfo", "lipi", "ebp",
+    "from", "advn", "adid", "tk", "vjs", "xkcb", "xpse", "xfps", "sjdu", "acatk", "camk",
+}
+
+
+def canonical_url(url):
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if parts.port and (parts.scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", urlencode(query), ""))
+
+
+class HttpCache:
+    """Decompressed response bodies plus validators, with TTL and LRU eviction.
+
+    Each entry is ``<sha256>.body`` and ``<sha256>.json``; the body's mtime
+    doubles as the last-access time for eviction.
+    """
+
+    def __init__(self, directory=CACHE_DIR, ttl=3600, max_bytes=256 * 1024 * 1024, offline=False):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._total = None
+
+    def _paths(self, url):
+        key = hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.body", self.directory / f"{key}.json"
+
+    def lookup(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            os.utime(body_path)
+        except (OSError, ValueError):
+            return None
+        return meta, body_path
+
+    def get(self, url):
+        if not (entry := self.lookup(url)):
+            return None
+        try:
+            return entry[0], entry[1].read_bytes()
+        except OSError:
+            return None
+
+    def is_fresh(self, meta):
+        return time.time() - meta.get("stored", 0) < self.ttl
+
+    @staticmethod
+    def validators(meta):
+        hdrs = {}
+        if etag := meta.get("etag"):
+            hdrs["If-None-Match"] = etag
+        if lm := meta.get("last_modified"):
+            hdrs["If-Modified-Since"] = lm
+        return hdrs
+
+    @staticmethod
+    def _meta(url, headers, size):
+        return {
+            "url": canonical_url(url),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored": time.time(),
+            "size": size,
+        }
+
+    def put(self, url, body, headers):
+        with self.writer(url, headers) as f:
+            f.write(body)
+
+    @contextmanager
+    def writer(self, url, headers):
+        """Stream a body into the cache; the entry only appears if the block completes."""
+        body_path, meta_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_path(body_path)
+        try:
+            with open(tmp, "wb") as f:
+                yield f
+                size = f.tell()
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            old = body_path.stat().st_size if body_path.exists() else 0
+            os.replace(tmp, body_path)
+            _atomic_write(meta_path, json.dumps(self._meta(url, headers, size)).encode("utf-8"))
+            if self._total is not None:
+                self._total += size - old
+            self._evict()
+
+    def refresh(self, url, meta, headers):
+        # 304 Not Modified: keep the body, restart the TTL and adopt new validators.
+        meta = dict(meta, stored=time.time())
+        meta["etag"] = headers.get("ETag") or meta.get("etag")
+        meta["last_modified"] = headers.get("Last-Modified") or meta.get("last_modified")
+        with self._lock:
+            _atomic_write(self._paths(url)[1], json.dumps(meta).encode("utf-8"))
+
+    def discard(self, url):
+        """Drop URL's entry, e.g. a 2xx body that turned out to be a CAPTCHA page."""
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            try:
+                size = body_path.stat().st_size
+                body_path.unlink()
+            except OSError:
+                size = 0
+            meta_path.unlink(missing_ok=True)
+            if self._total is not None:
+                self._total -= size
+
+    def _evict(self):
+        if self._total is None:
+            self._total = sum(p.stat().st_size for p in self.directory.glob("*.body"))
+        if self._total <= self.max_bytes:
+            return
+        entries = []
+        for p in self.directory.glob("*.body"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        for _, size, p in sorted(entries):
+            if self._total <= self.max_bytes:
+                break
+            for victim in (p, p.with_suffix(".json")):
+                try:
+                    victim.unlink()
+                except OSError:
+                    pass
+            self._total -= size
+
+
+def _tmp_path(path):
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _atomic_write(path, data):
+    tmp = _tmp_path(path)
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -0,0 +1,176 @@
+"""Reusable HTTP session with per-host keep-alive connection pools.
+
+Proxies come from the environment (``http_proxy``, ``https_proxy``,
+``no_proxy``) or the system settings, as with urllib: plain HTTP goes to the
+proxy with the full URL, HTTPS through a CONNECT tunnel.
+"""
+
+import base64
+import http.client
+import http.cookiejar
+import io
+import ssl
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+
+import timings
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+_STALE = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.BadStatusLine)
+
+
+class Session:
+    """Pooled connections, one cookie jar and fixed default headers.
+
+    Safe to share between threads: each request checks a connection out of
+    its host's pool and only returns it once the response was fully read.
+    """
+
+    def __init__(self, headers=None, jar=None, timeout=30, max_idle=4, save_cookies=False, proxies=None):
+        self.headers = dict(headers or {})
+        # {"http": url, "https": url, "no": "host,..."}, as urllib.request.getproxies() returns.
+        self.proxies = urllib.request.getproxies() if proxies is None else dict(proxies)
+        self.jar = jar if jar is not None else http.cookiejar.CookieJar()
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.save_cookies = save_cookies
+        # Optional page_archive.PageArchive; the scraper records decoded bodies into it.
+        self.archive = None
+        # Optional rate_limit.RateLimiter; the scraper paces and retries fetches through it.
+        self.limiter = None
+        self._ssl = ssl.create_default_context()
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _proxy(self, scheme, host, port):
+        """(host, port, Proxy-Authorization or None) of the proxy for this origin, or None to connect directly."""
+        proxy = self.proxies.get(scheme)
+        if not proxy:
+            return None
+        origin = host if port in (None, 80, 443) else f"{host}:{port}"
+        if "no" in self.proxies:
+            if urllib.request.proxy_bypass_environment(origin, self.proxies):
+                return None
+        elif urllib.request.proxy_bypass(origin):
+            return None
+        parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        if parts.scheme != "http" or not parts.hostname:
+            raise urllib.error.URLError(f"Unsupported {scheme} proxy {proxy!r}; use an http:// proxy")
+        auth = None
+        if parts.username is not None:
+            cred = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+            auth = "Basic " + base64.b64encode(cred.encode("utf-8")).decode("ascii")
+        return parts.hostname, parts.port or 80, auth
+
+    def _checkout(self, key):
+        with self._lock:
+            pool = self._idle.get(key)
+            if pool:
+                return pool.pop(), True
+        scheme, host, port, proxy = key
+        if proxy is None:
+            if scheme == "https":
+                return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl), False
+            return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+        proxy_host, proxy_port, auth = proxy
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=self.timeout, context=self._ssl)
+            conn.set_tunnel(host, port, headers={"Proxy-Authorization": auth} if auth else None)
+            return conn, False
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=self.timeout), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self.max_idle:
+                pool.append(conn)
+                return
+        conn.close()
+
+    def _send(self, url, extra_headers):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"unknown url type: {url!r}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        proxy = self._proxy(parts.scheme, parts.hostname, parts.port)
+        key = (parts.scheme, parts.hostname, port, proxy)
+
+        req = urllib.request.Request(url, headers={**self.headers, **(extra_headers or {})})
+        self.jar.add_cookie_header(req)
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        hdrs = dict(req.header_items())
+        if proxy and parts.scheme == "http":
+            # A plain HTTP proxy takes the absolute URL; HTTPS goes through the CONNECT tunnel.
+            path = urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path or "/", parts.query, ""))
+            if proxy[2]:
+                hdrs["Proxy-Authorization"] = proxy[2]
+
+        for attempt in range(2):
+            conn, reused = self._checkout(key)
+            try:
+                # Covers DNS, TCP and TLS setup on a fresh connection, plus time to first byte.
+                with timings.span("http_request", host=parts.hostname, reused=reused) as sp:
+                    conn.request("GET", path, headers=hdrs)
+                    resp = conn.getresponse()
+                    sp.set(status=resp.status)
+            except _STALE:
+                conn.close()
+                if reused and not attempt:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            self.jar.extract_cookies(resp, req)
+            return key, conn, resp
+        raise RuntimeError("unreachable")
+
+    def _release(self, key, conn, resp):
+        # Only a fully drained, keep-alive response leaves the socket reusable.
+        if resp.isclosed() and not resp.will_close:
+            self._checkin(key, conn)
+        else:
+            conn.close()
+
+    @contextmanager
+    def open(self, url, extra_headers=None):
+        """Yield a streaming response, following redirects; raise HTTPError on 304/4xx/5xx."""
+        for _ in range(10):
+            key, conn, resp = self._send(url, extra_headers)
+            if resp.status in _REDIRECTS and resp.getheader("Location"):
+                resp.read()
+                self._release(key, conn, resp)
+                url = urllib.parse.urljoin(url, resp.getheader("Location"))
+                continue
+            if resp.status >= 300:
+                body = resp.read()
+                self._release(key, conn, resp)
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(body))
+            try:
+                yield resp
+            finally:
+                self._release(key, conn, resp)
+            return
+        raise urllib.error.URLError(f"Too many redirects: {url}")
+
+    def get(self, url, extra_headers=None):
+        with self.open(url, extra_headers) as resp:
+            return resp.read(), resp.headers
+
+    def close(self):
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for pool in pools.values():
+            for conn in pool:
+                conn.close()
+        if self.save_cookies and isinstance(self.jar, http.cookiejar.FileCookieJar):
+            self.jar.save(ignore_discard=True, ignore_expires=True)
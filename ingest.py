@@ -0,0 +1,238 @@
+"""Bulk offline ingestion of saved pages: folders, MHTML, .zip and .tar.gz archives."""
+
+import email
+import email.policy
+import json
+import mmap
+import os
+import re
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import job_index
+import processor
+import scraper
+from batch import available_cpus
+
+PAGE_EXTS = (".html", ".htm", ".mhtml", ".mht")
+MMAP_MIN_BYTES = 1024 * 1024
+
+_SAVED_FROM_RE = re.compile(rb"<!--\s*saved from url=\(\d+\)(\S+?)\s*-->", re.I)
+_CANONICAL_RE = re.compile(rb"""<link\b[^>]*\brel=["']?canonical["']?[^>]*\bhref=["']([^"'>\s]+)""", re.I)
+_SNIFF = 64 * 1024
+
+_archives = {}
+
+
+def _is_page(name):
+    return name.lower().endswith(PAGE_EXTS)
+
+
+def _archive_kind(path):
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar.gz", ".tgz", ".tar")):
+        return "tar"
+    return None
+
+
+def find_sources(root):
+    """Yield (key, kind, path, member) for every page under ROOT, archives included."""
+    root = Path(root)
+    paths = [root] if root.is_file() else sorted(p for p in root.rglob("*") if p.is_file())
+    for path in paths:
+        kind = _archive_kind(path)
+        if kind == "zip":
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir() and _is_page(info.filename):
+                        yield f"{path}::{info.filename}", "zip", str(path), info.filename
+        elif kind == "tar":
+            with tarfile.open(path) as tf:
+                for info in tf:
+                    if info.isfile() and _is_page(info.name):
+                        yield f"{path}::{info.name}", "tar", str(path), info.name
+        elif _is_page(path.name):
+            yield str(path), "file", str(path), None
+
+
+def _read_file(path):
+    size = os.path.getsize(path)
+    if size < MMAP_MIN_BYTES:
+        with open(path, "rb") as f:
+            return f.read()
+    # Decode straight from the mapping; no intermediate copy of a large page.
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return memoryview(mm).tobytes() if _is_mhtml_name(path) else str(mm, "utf-8", "replace")
+
+
+def _is_mhtml_name(name):
+    return name.lower().endswith((".mhtml", ".mht"))
+
+
+def _read_zip_member(archive, member):
+    # One open ZipFile per worker process and archive; the central directory is read once.
+    zf = _archives.get(archive)
+    if zf is None:
+        zf = _archives[archive] = zipfile.ZipFile(archive)
+    return zf.read(member)
+
+
+def _from_mhtml(data):
+    msg = email.message_from_bytes(data, policy=email.policy.default)
+    url = msg.get("Snapshot-Content-Location") or ""
+    for part in msg.walk():
+        if part.get_content_type() == "text/html":
+            return part.get_content(), url or part.get("Content-Location") or ""
+    raise ValueError("No text/html part in MHTML file")
+
+
+def _source_url(head):
+    m = _SAVED_FROM_RE.search(head) or _CANONICAL_RE.search(head)
+    return m.group(1).decode("utf-8", "replace") if m else ""
+
+
+def _load(kind, path, member, data=None):
+    name = member or path
+    if data is None:
+        data = _read_file(path) if kind == "file" else _read_zip_member(path, member)
+    if _is_mhtml_name(name):
+        return _from_mhtml(data)
+    if isinstance(data, str):
+        return data, _source_url(data[:_SNIFF].encode("utf-8", "replace"))
+    return data.decode("utf-8", "replace"), _source_url(data[:_SNIFF])
+
+
+def parse_source(kind, path, member=None, data=None):
+    html, url = _load(kind, path, member, data)
+    return scraper.extract_job(html, url), url
+
+
+def _iter_work(sources, done):
+    # Tar members can only be read in order, so they're read here and shipped
+    # to the workers as bytes; files and zip members are read by the workers.
+    tars = {}
+    for key, kind, path, member in sources:
+        if key in done:
+            continue
+        if kind == "tar":
+            tars.setdefault(path, {})[member] = key
+        else:
+            yield key, (kind, path, member, None)
+    for path, members in tars.items():
+        with tarfile.open(path) as tf:
+            for info in tf:
+                key = members.get(info.name)
+                if key is not None and info.isfile():
+                    yield key, ("tar", path, info.name, tf.extractfile(info).read())
+
+
+def read_checkpoint(path, retry_failed=False):
+    done = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by an interrupted run
+                if rec.get("ok") or not retry_failed:
+                    done[rec["source"]] = rec
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class _Progress:
+    def __init__(self, total, stream=sys.stderr, every=0.5):
+        self.total, self.stream, self.every = total, stream, every
+        self.ok = self.failed = 0
+        self.t0 = self.last = time.monotonic()
+
+    def _draw(self, now):
+        self.last = now
+        n = self.ok + self.failed
+        rate = n / max(now - self.t0, 1e-9)
+        self.stream.write(f"\r[{n}/{self.total}] {self.ok} created, {self.failed} failed, {rate:.0f}/s ")
+        self.stream.flush()
+
+    def update(self, ok):
+        if ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+        now = time.monotonic()
+        if now - self.last >= self.every:
+            self._draw(now)
+
+    def close(self):
+        self._draw(time.monotonic())
+        self.stream.write("\n")
+
+
+def _log(log, lines):
+    log.writelines(lines)
+    log.flush()
+    lines.clear()
+
+
+def run_ingest(root, base_dir, checkpoint, french=False, procs=None, retry_failed=False, progress=True, index=None,
+               manifest=None, sink=None, fill=False):
+    """Create a folder for every page under ROOT; returns (created, duplicates, failed, skipped)."""
+    done = read_checkpoint(checkpoint, retry_failed)
+    sources = list(find_sources(root))
+    todo = sum(1 for s in sources if s[0] not in done)
+    bar = _Progress(todo) if progress and todo else None
+    procs = procs or available_cpus()
+    created = duplicates = failed = 0
+
+    with open(checkpoint, "a", encoding="utf-8") as log, ProcessPoolExecutor(max_workers=procs) as pool:
+        work = _iter_work(sources, done)
+        pending = {}
+        # Lines for pages whose bundles still sit in the sink's open batch;
+        # they're logged once the batch is committed, never before.
+        held = []
+        try:
+            while True:
+                # Keep a bounded window in flight so 50k pages never sit in memory at once.
+                while len(pending) < procs * 4:
+                    item = next(work, None)
+                    if item is None:
+                        break
+                    key, args = item
+                    pending[pool.submit(parse_source, *args)] = key
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    key = pending.pop(fut)
+                    try:
+                        job, url = fut.result()
+                        out = processor.process_job(job, base_dir, url or None, french=french, index=index,
+                                                    manifest=manifest, sink=sink, fill=fill)
+                        rec = {"source": key, "ok": True, "folder": str(out["folder_path"])}
+                        created += 1
+                    except job_index.Duplicate as e:
+                        rec = {"source": key, "ok": True, "duplicate": e.reason, "folder": e.folder}
+                        duplicates += 1
+                    except Exception as e:
+                        rec = {"source": key, "ok": False, "error": str(e) or type(e).__name__}
+                        failed += 1
+                    held.append(json.dumps(rec, ensure_ascii=False) + "\n")
+                    # One line per page, flushed, so an interrupted run resumes after it.
+                    if not (sink and sink.pending):
+                        _log(log, held)
+                    if bar:
+                        bar.update(rec["ok"])
+        finally:
+            if sink and held:
+                sink.flush()
+                _log(log, held)
+    if bar:
+        bar.close()
+    return created, duplicates, failed, len(sources) - todo
@@ -0,0 +1,153 @@
+"""Persistent index of processed postings for duplicate detection.
+
+A posting is known by any of: its canonical URL, its site job ID (Indeed
+``jk``, LinkedIn job view / ``currentJobId``) or a hash of its normalized
+title, company and description. All three are indexed columns in SQLite.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from http_cache import CACHE_ROOT, canonical_url
+
+INDEX_PATH = CACHE_ROOT / "index.sqlite3"
+
+_LI_VIEW_RE = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d{6,})")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    folder TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_content ON postings(content_hash);
+CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, posting INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS site_ids (site TEXT, job_id TEXT, posting INTEGER NOT NULL, PRIMARY KEY (site, job_id)) WITHOUT ROWID;
+"""
+
+
+class Duplicate(Exception):
+    """The posting was already processed into FOLDER."""
+
+    def __init__(self, folder, reason):
+        super().__init__(f"Already processed ({reason}): {folder}")
+        self.folder = folder
+        self.reason = reason
+
+
+def site_job_id(url):
+    """Return (site, job_id) when URL names a specific Indeed or LinkedIn job, else None."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    query = parse_qs(parts.query)
+    if re.search(r"(^|\.)indeed\.[a-z.]+$", host):
+        jk = (query.get("jk") or query.get("vjk") or [None])[0]
+        return ("indeed", jk.lower()) if jk else None
+    if host == "linkedin.com" or host.endswith(".linkedin.com"):
+        if m := _LI_VIEW_RE.search(parts.path):
+            return "linkedin", m.group(1)
+        if jid := (query.get("currentJobId") or [None])[0]:
+            return "linkedin", jid
+    return None
+
+
+def _norm(text):
+    return " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+
+
+def content_hash(job):
+    # A JobPosting keeps its hash once computed; a dict is hashed every time.
+    return getattr(job, "content_hash", None) or hash_fields(job)
+
+
+def hash_fields(job):
+    h = hashlib.sha256()
+    for key in ("title", "company", "description"):
+        h.update(_norm(job.get(key)).encode("utf-8") + b"\0")
+    return h.hexdigest()
+
+
+class JobIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def _db(self):
+        # Opened on first use (always under self._lock), so a run that never
+        # checks a posting doesn't import sqlite3 or touch the file.
+        if self._conn is None:
+            import sqlite3
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            self._conn = db
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _folder(self, posting_id):
+        row = self._db.execute("SELECT folder FROM postings WHERE id = ?", (posting_id,)).fetchone()
+        # A folder deleted by hand no longer counts as processed; bundles in
+        # an archive or database sink ("<file>::<folder>") aren't checked.
+        if not row or ("::" not in row[0] and not Path(row[0]).is_dir()):
+            return None
+        self._db.execute("UPDATE postings SET last_seen = ? WHERE id = ?", (time.time(), posting_id))
+        return row[0]
+
+    def check_url(self, url):
+        """Raise Duplicate if URL (or the site job it names) was already processed."""
+        with self._lock:
+            row = self._db.execute("SELECT posting FROM urls WHERE url = ?", (canonical_url(url),)).fetchone()
+            if row and (folder := self._folder(row[0])):
+                raise Duplicate(folder, "same URL")
+            if sid := site_job_id(url):
+                row = self._db.execute("SELECT posting FROM site_ids WHERE site = ? AND job_id = ?", sid).fetchone()
+                if row and (folder := self._folder(row[0])):
+                    raise Duplicate(folder, f"same {sid[0]} job {sid[1]}")
+
+    def check_content(self, job, url=None):
+        """Raise Duplicate if a posting with the same content was processed; URL becomes an alias of it."""
+        digest = content_hash(job)
+        with self._lock:
+            for (posting_id,) in self._db.execute("SELECT id FROM postings WHERE content_hash = ?", (digest,)).fetchall():
+                if folder := self._folder(posting_id):
+                    if url:
+                        self._alias(posting_id, url)
+                    raise Duplicate(folder, "same content")
+        return digest
+
+    def _alias(self, posting_id, url):
+        self._db.execute("INSERT OR REPLACE INTO urls VALUES (?, ?)", (canonical_url(url), posting_id))
+        if sid := site_job_id(url):
+            self._db.execute("INSERT OR REPLACE INTO site_ids VALUES (?, ?, ?)", (*sid, posting_id))
+
+    def add(self, job, folder, url=None, digest=None):
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            cur = self._db.execute(
+                "INSERT INTO postings (folder, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                (str(folder), digest or content_hash(job), now, now),
+            )
+            if url:
+                self._alias(cur.lastrowid, url)
@@ -0,0 +1,81 @@
+"""Compact record for one parsed job posting.
+
+The parsers return ``JobPosting`` objects rather than dicts. The class uses
+``__slots__``, so an instance has no per-object dict. Company names are
+interned, so every posting from one employer shares a single string. The
+canonical ID and the content hash are computed the first time they are
+asked for and then kept; the hash is stored as its raw 32 bytes.
+``get()`` and ``[]`` read fields by the old dict keys, so code written for
+dicts (and plain dicts) keeps working. Fields are not meant to change after
+construction. To save or send postings, pickle them: each one pickles as
+a plain tuple of its fields, and the company is interned again on load.
+"""
+
+import sys
+
+FIELDS = ("title", "company", "description", "url")
+_KEYS = FIELDS + ("canonical_id", "content_hash")
+
+
+class JobPosting:
+    __slots__ = ("title", "company", "description", "url", "_canonical_id", "_digest")
+
+    def __init__(self, title="", company="", description="", url=None, digest=None):
+        self.title = title or ""
+        self.company = sys.intern(company) if company else ""
+        self.description = description or ""
+        self.url = url or None
+        self._canonical_id = None
+        self._digest = digest
+
+    @property
+    def canonical_id(self):
+        """``site:job_id`` for Indeed/LinkedIn job URLs, else the canonical URL; None without a URL."""
+        if self._canonical_id is None and self.url:
+            from http_cache import canonical_url
+            from job_index import site_job_id
+
+            sid = site_job_id(self.url)
+            self._canonical_id = f"{sid[0]}:{sid[1]}" if sid else canonical_url(self.url)
+        return self._canonical_id
+
+    @property
+    def content_hash(self):
+        """Hex SHA-256 of the normalized title, company and description (see job_index)."""
+        if self._digest is None:
+            from job_index import hash_fields
+
+            self._digest = bytes.fromhex(hash_fields(self))
+        return self._digest.hex()
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in _KEYS else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self):
+        """The dict the parsers used to return, plus ``url`` when there is one."""
+        d = {"title": self.title, "company": self.company, "description": self.description}
+        if self.url:
+            d["url"] = self.url
+        return d
+
+    def __eq__(self, other):
+        if not isinstance(other, JobPosting):
+            return NotImplemented
+        return (self.title, self.company, self.description, self.url) == \
+            (other.title, other.company, other.description, other.url)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"JobPosting(title={self.title!r}, company={self.company!r}, url={self.url!r})"
+
+    def __reduce__(self):
+        # Pickled to and from worker processes as a plain tuple; the company is re-interned on arrival.
+        return JobPosting, (self.title, self.company, self.description, self.url, self._digest)
+
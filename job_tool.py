@@ -1,39 +1,26 @@
 #!/usr/bin/env python3
 """CLI for creating job application folders from job postings."""
 
-import argparse
-import shutil
-import subprocess
+import os
+import sys
 from pathlib import Path
 from urllib.parse import urlparse
-from urllib.request import url2pathname
 
-import processor
-import scraper
+import timings
 
+# Each route imports only the modules it needs (argparse included), so a .tex
+# compile from an editor hook never loads the HTTP stack; benchmarks/importtime.py
+# keeps each route within its budget.
+if os.name == "nt":
+    from nturl2path import url2pathname
+else:
+    from urllib.parse import unquote as url2pathname
 
-def _compile_resume(tex_arg):
-    path = _parse_path(tex_arg)
-    if path.suffix.lower() != ".tex" or not path.is_file():
-        raise ValueError(f"Invalid .tex file: {path}")
 
-    stem = "Resume"
-    _cleanup_aux(path.parent, stem)
+def _compile_resume(tex_arg, use_format=True):
+    import latex_build
 
-    try:
-        result = subprocess.run(
-            ["pdflatex", "-interaction=nonstopmode", f"-jobname={stem}", path.name],
-            cwd=path.parent, capture_output=True, text=True
-        )
-    except FileNotFoundError:
-        raise RuntimeError("pdflatex not found. Install TeX Live.") from None
-    finally:
-        _cleanup_aux(path.parent, stem)
-
-    if result.returncode != 0:
-        raise RuntimeError(f"pdflatex failed:\n{result.stdout}")
-
-    return path.parent / f"{stem}.pdf"
+    return latex_build.compile_tex(_parse_path(tex_arg), use_format=use_format)
 
 
 def _parse_path(value):
@@ -46,15 +33,10 @@ def _parse_path(value):
     return Path(value).expanduser().resolve()
 
 
-def _cleanup_aux(directory, stem):
-    for ext in (".aux", ".log", ".out", ".toc", ".nav", ".snm", ".fls", ".fdb_latexmk", ".synctex.gz"):
-        try:
-            (directory / f"{stem}{ext}").unlink()
-        except OSError:
-            pass
-
-
 def _open_in_vscode(path):
+    import shutil
+    import subprocess
+
     code = shutil.which("code") or shutil.which("code.cmd")
     if code:
         try:
@@ -65,11 +47,560 @@ def _open_in_vscode(path):
     return False
 
 
+def _make_cache(args):
+    if args.no_cache:
+        return None
+    import http_cache
+
+    return http_cache.HttpCache(ttl=args.cache_ttl, offline=args.offline)
+
+
+def _make_archive(args):
+    if args.no_archive:
+        return None
+    import page_archive
+
+    return page_archive.PageArchive()
+
+
+def _make_index(args):
+    if args.no_index:
+        return None
+    import job_index
+
+    return job_index.JobIndex()
+
+
+def _make_manifest(args, base_dir):
+    # layout.MANIFEST_NAME; layout itself is only imported when there is one.
+    if not args.layout and not (Path(base_dir) / "manifest.jsonl").is_file():
+        return None
+    import layout
+
+    return layout.Manifest(base_dir, args.layout)
+
+
+def _layout_name(value):
+    import argparse
+
+    import layout
+
+    if value not in layout.LAYOUTS:
+        raise argparse.ArgumentTypeError(f"invalid choice: {value!r} (choose from {', '.join(layout.LAYOUTS)})")
+    return value
+
+
+def _add_layout_arg(parser):
+    parser.add_argument("--layout", type=_layout_name, metavar="{flat,company,month,month/company}",
+                        help="Shard job folders and keep manifest.jsonl (remembered once set)")
+
+
+def _add_fill_arg(parser):
+    parser.add_argument("--fill", action="store_true",
+                        help="Put the posting's title and company in place of [TITLE] and [COMPANY] in the prompts")
+
+
+def _add_sink_arg(parser):
+    parser.add_argument("--sink", metavar="FILE",
+                        help="Write job bundles into one .zip, .tar or .sqlite file instead of folders (see materialize)")
+
+
+def _make_sink(args, batch=None):
+    """A context manager yielding the --sink sink, or None for plain folders."""
+    if not args.sink:
+        from contextlib import nullcontext
+
+        return nullcontext()
+    import sinks
+
+    try:
+        return sinks.open_sink(_parse_path(args.sink), batch or sinks.BATCH)
+    except (ValueError, OSError) as e:
+        raise SystemExit(f"--sink: {e}")
+
+
+def _run_batch(args):
+    import batch
+    import scraper
+
+    if args.batch == "-":
+        urls = list(batch.read_urls(sys.stdin))
+    else:
+        with open(args.batch, encoding="utf-8") as f:
+            urls = list(batch.read_urls(f))
+
+    with scraper.new_session(save_cookies=args.save_cookies, archive=_make_archive(args)) as session, \
+            _make_sink(args) as sink:
+        results = batch.run_batch(urls, Path.cwd(), french=args.vf, workers=args.workers, procs=args.procs,
+                                  cache=_make_cache(args), session=session, index=_make_index(args),
+                                  manifest=_make_manifest(args, Path.cwd()), sink=sink, fill=args.fill)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            batch.write_summary(results, f)
+    else:
+        batch.write_summary(results, sys.stdout)
+
+    failed = sum(1 for r in results if not r["ok"])
+    skipped = sum(1 for r in results if r.get("skipped"))
+    print(f"Batch: {len(results) - failed - skipped} created, {skipped} duplicates, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _add_timing_args(parser):
+    parser.add_argument("--timings", action="store_true", help="Print a per-stage timing breakdown to stderr")
+    parser.add_argument("--trace", metavar="FILE", help="Write spans (time, bytes, peak memory) as JSONL")
+
+
+def _start_timings(args):
+    if args.timings or args.trace:
+        timings.enable(memory=bool(args.trace))
+
+
+def _finish_timings(args):
+    if not timings.enabled():
+        return
+    spans = timings.disable()
+    if args.trace:
+        timings.write_trace(spans, args.trace)
+    if args.timings:
+        print(timings.summary(spans), file=sys.stderr)
+
+
+def _cmd_build_all(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py build-all", description="Build Resume.pdf in every job folder under ROOT.")
+    parser.add_argument("root", nargs="?", default=".", help="Directory containing job folders (default: cwd)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Parallel builds (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even when sources are unchanged")
+    parser.add_argument("--no-format", action="store_true", help="Don't use a precompiled preamble format")
+    _add_timing_args(parser)
+    args = parser.parse_args(argv)
+    import latex_build
+
+    _start_timings(args)
+    try:
+        results = latex_build.build_all(_parse_path(args.root), workers=args.jobs, force=args.force,
+                                        use_format=not args.no_format)
+    finally:
+        _finish_timings(args)
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+        if r["status"] == "failed":
+            print(f"Failed: {r['tex']}\n{r['error']}", file=sys.stderr)
+        elif r["status"] == "built":
+            print(f"Created: {r['pdf']}")
+    print(", ".join(f"{n} {s}" for s, n in sorted(counts.items())) or "No .tex files found")
+    return 1 if counts.get("failed") else 0
+
+
+def _cmd_serve(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py serve", description="Create job folders from postings sent to a local HTTP API.")
+    parser.add_argument("--port", type=int, default=8765, help="Port on 127.0.0.1 (default: 8765)")
+    parser.add_argument("--dir", default=".", help="Where job folders are created (default: cwd)")
+    parser.add_argument("--token", help="Require this value in an X-Job-Token header")
+    parser.add_argument("-vf", action="store_true", help="French mode unless a request says otherwise")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP cache")
+    parser.add_argument("--cache-ttl", type=int, default=3600, help="Seconds before a cached page is revalidated")
+    parser.add_argument("--save-cookies", action="store_true", help="Write updated cookies back to cookies.txt on exit")
+    parser.add_argument("--no-archive", action="store_true", help="Don't keep fetched pages in the page archive")
+    parser.add_argument("--no-index", action="store_true", help="Process postings even if already seen")
+    _add_fill_arg(parser)
+    _add_layout_arg(parser)
+    _add_sink_arg(parser)
+    parser.add_argument("--quiet", action="store_true", help="Don't log each request")
+    args = parser.parse_args(argv)
+    args.offline = False
+    import scraper
+    import server
+
+    base_dir = _parse_path(args.dir)
+    # batch=1: each posting is committed as it arrives, nobody waits for a batch to fill.
+    with _make_sink(args, batch=1) as sink:
+        httpd = server.JobServer(("127.0.0.1", args.port), base_dir, cache=_make_cache(args),
+                                 session=scraper.new_session(save_cookies=args.save_cookies, archive=_make_archive(args)),
+                                 index=_make_index(args), manifest=_make_manifest(args, base_dir), sink=sink,
+                                 french=args.vf, token=args.token, quiet=args.quiet, fill=args.fill)
+        host, port = httpd.server_address[:2]
+        print(f"Serving on http://{host}:{port}/jobs (Ctrl+C to stop)", flush=True)
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+    return 0
+
+
+def _cmd_watch(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py watch", description="Process postings saved or dropped into a folder as they arrive.")
+    parser.add_argument("folder", help="Folder to watch (e.g. Downloads) for .html/.mhtml pages and .url/.txt link files")
+    parser.add_argument("--dir", default=".", help="Where job folders are created (default: cwd)")
+    parser.add_argument("-vf", action="store_true", help="French mode")
+    parser.add_argument("--workers", type=int, default=2, help="Files handled at once (default: 2)")
+    parser.add_argument("--settle", type=float, default=0.2, help="Seconds a file must stay unchanged before it's read (default: 0.2)")
+    parser.add_argument("--poll", action="store_true", help="Rescan instead of using inotify (network filesystems)")
+    parser.add_argument("--cursor", help="JSONL log of handled files (default: FOLDER/.watch-cursor.jsonl)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP cache")
+    parser.add_argument("--cache-ttl", type=int, default=3600, help="Seconds before a cached page is revalidated")
+    parser.add_argument("--save-cookies", action="store_true", help="Write updated cookies back to cookies.txt on exit")
+    parser.add_argument("--no-archive", action="store_true", help="Don't keep fetched pages in the page archive")
+    parser.add_argument("--no-index", action="store_true", help="Process postings even if already seen")
+    _add_fill_arg(parser)
+    _add_layout_arg(parser)
+    _add_sink_arg(parser)
+    args = parser.parse_args(argv)
+    args.offline = False
+    import scraper
+    import watch
+
+    folder = _parse_path(args.folder)
+    if not folder.is_dir():
+        parser.error(f"Not a folder: {folder}")
+
+    def report(r):
+        if r.get("skipped"):
+            print(f"Skipped: {r['file']}: already processed ({r['skipped']}): {r['folder']}", flush=True)
+        elif r["ok"]:
+            print(f"Created: {r['folder']}", flush=True)
+        else:
+            print(f"Failed: {r['file']}" + (f" ({r['url']})" if r["url"] else "") + f": {r['error']}", file=sys.stderr, flush=True)
+
+    base_dir = _parse_path(args.dir)
+    with scraper.new_session(save_cookies=args.save_cookies, archive=_make_archive(args)) as session, \
+            _make_sink(args, batch=1) as sink:
+        watcher = watch.Watcher(folder, base_dir, cursor=args.cursor, french=args.vf, workers=args.workers,
+                                cache=_make_cache(args), session=session, index=_make_index(args),
+                                manifest=_make_manifest(args, base_dir), sink=sink, settle=args.settle, poll=args.poll,
+                                on_result=report, fill=args.fill)
+        print(f"Watching {folder} (Ctrl+C to stop)", flush=True)
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _cmd_ingest(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py ingest", description="Create job folders from saved pages in a folder or archive.")
+    parser.add_argument("source", help="Folder, .zip, .tar.gz or single saved page (.html, .htm, .mhtml)")
+    parser.add_argument("-vf", action="store_true", help="French mode")
+    parser.add_argument("--procs", type=int, default=None, help="Parser processes (default: available CPUs)")
+    parser.add_argument("--checkpoint", default=".ingest.jsonl", help="JSONL log of finished pages; reruns skip them")
+    parser.add_argument("--retry-failed", action="store_true", help="Parse pages the checkpoint lists as failed again")
+    parser.add_argument("--no-index", action="store_true", help="Process postings even if already seen")
+    _add_fill_arg(parser)
+    _add_layout_arg(parser)
+    _add_sink_arg(parser)
+    parser.add_argument("--quiet", action="store_true", help="No progress line")
+    args = parser.parse_args(argv)
+    import ingest
+
+    source = _parse_path(args.source)
+    if not source.exists():
+        parser.error(f"Not found: {source}")
+    with _make_sink(args) as sink:
+        counts = ingest.run_ingest(source, Path.cwd(), args.checkpoint, french=args.vf, procs=args.procs,
+                                   retry_failed=args.retry_failed, progress=not args.quiet, index=_make_index(args),
+                                   manifest=_make_manifest(args, Path.cwd()), sink=sink, fill=args.fill)
+    created, duplicates, failed, skipped = counts
+    print(f"Ingest: {created} created, {duplicates} duplicates, {failed} failed, {skipped} already done (see {args.checkpoint})")
+    return 1 if failed else 0
+
+
+def _cmd_replay(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py replay", description="Re-parse archived pages and refresh job folders whose output changed.")
+    parser.add_argument("-vf", action="store_true", help="French prompts for new folders (existing ones keep theirs)")
+    parser.add_argument("--archive", default=None, help="Archive directory (default: .cache/archive)")
+    parser.add_argument("--procs", type=int, default=None, help="Parser processes (default: available CPUs)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--summary", metavar="FILE", help="Write one JSON line per URL here")
+    parser.add_argument("--fill", action="store_true",
+                        help="Fill [TITLE] and [COMPANY] in new folders' prompts (existing ones keep theirs)")
+    args = parser.parse_args(argv)
+    import json
+
+    import page_archive
+    import replay
+
+    archive = page_archive.PageArchive(args.archive) if args.archive else page_archive.PageArchive()
+    args.layout = None
+    manifest = _make_manifest(args, Path.cwd())
+    counts = {}
+    out = open(args.summary, "w", encoding="utf-8") if args.summary else None
+    try:
+        for r in replay.run_replay(archive, Path.cwd(), french=args.vf, procs=args.procs, dry_run=args.dry_run,
+                                   manifest=manifest, fill=args.fill):
+            counts[r["status"]] = counts.get(r["status"], 0) + 1
+            if out:
+                out.write(json.dumps(r, ensure_ascii=False) + "\n")
+            if r["status"] in ("created", "updated", "renamed"):
+                label = "Would " + r["status"][:-1] if args.dry_run else r["status"].capitalize()
+                print(f"{label}: {r['previous']} -> {r['folder']}" if "previous" in r else f"{label}: {r['folder']}")
+            elif r["status"] == "failed":
+                print(f"Failed: {r['url']}: {r['error']}", file=sys.stderr)
+    finally:
+        if out:
+            out.close()
+    print(", ".join(f"{n} {s}" for s, n in sorted(counts.items())) or "Archive is empty")
+    return 1 if counts.get("failed") else 0
+
+
+def _cmd_search(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py search", description="Search job folder descriptions.",
+                                     epilog='Words are ANDed. Also: OR, NOT, -word, prefix*, "exact phrase", (groups).')
+    parser.add_argument("query", nargs="+", help='e.g. kubernetes rust montreal, or "site reliability" -java')
+    parser.add_argument("--dir", default=".", help="Folder holding the job folders (default: cwd)")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="Results to show (default: 20)")
+    parser.add_argument("--no-refresh", action="store_true", help="Query the index as is, without picking up changed folders")
+    args = parser.parse_args(argv)
+    import time
+
+    import search_index
+
+    with search_index.SearchIndex(_parse_path(args.dir)) as index:
+        if not args.no_refresh:
+            added, updated, removed = index.refresh()
+            if added or updated or removed:
+                print(f"Index: {added} added, {updated} updated, {removed} removed", file=sys.stderr)
+        t0 = time.perf_counter()
+        try:
+            hits = index.search(" ".join(args.query), args.limit)
+        except ValueError as e:
+            parser.error(str(e))
+        elapsed = (time.perf_counter() - t0) * 1000
+        for folder, score, snippet, source in hits:
+            print(f"{score:7.2f}  {folder}")
+            print(f"         {snippet}")
+            if source:
+                print(f"         {source}")
+        print(f"{len(hits)} result(s) from {index.count()} postings in {elapsed:.1f} ms", file=sys.stderr)
+    return 0 if hits else 1
+
+
+def _cmd_rank(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py rank", description="Rank job folders by how closely they match a resume.")
+    parser.add_argument("--resume", help="Resume as .tex or plain text (default: templates/resume-template.tex)")
+    parser.add_argument("--dir", default=".", help="Folder holding the job folders (default: cwd)")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="Results to show (default: 20)")
+    parser.add_argument("--no-refresh", action="store_true", help="Rank the cached vectors as is, without picking up changed folders")
+    args = parser.parse_args(argv)
+    import time
+
+    import ranking
+
+    resume = _parse_path(args.resume) if args.resume else ranking.RESUME_TEMPLATE
+    try:
+        text = resume.read_text(encoding="utf-8", errors="replace")
+    except OSError as e:
+        parser.error(f"Cannot read resume: {e}")
+    if resume.suffix.lower() == ".tex":
+        text = ranking.tex_text(text)
+
+    with ranking.RankIndex(_parse_path(args.dir)) as index:
+        if not args.no_refresh:
+            added, updated, removed = index.refresh()
+            if added or updated or removed:
+                print(f"Index: {added} added, {updated} updated, {removed} removed", file=sys.stderr)
+        t0 = time.perf_counter()
+        hits = index.rank(text, args.limit)
+        elapsed = (time.perf_counter() - t0) * 1000
+        for folder, score, source in hits:
+            print(f"{score:6.3f}  {folder}" + (f"  {source}" if source else ""))
+        print(f"Ranked {index.count()} postings in {elapsed:.0f} ms", file=sys.stderr)
+    return 0 if hits else 1
+
+
+def _cmd_materialize(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py materialize", description="Expand a job bundle from a --sink file into a real folder.")
+    parser.add_argument("sink", help="The .zip, .tar or .sqlite file written with --sink")
+    parser.add_argument("folder", nargs="?", help="Bundle folder, or any unique part of its name")
+    parser.add_argument("--dir", default=".", help="Where the folder is created (default: cwd)")
+    parser.add_argument("--list", action="store_true", help="List the bundles in the sink instead")
+    args = parser.parse_args(argv)
+    import sinks
+
+    path = _parse_path(args.sink)
+    if not path.is_file():
+        parser.error(f"Not found: {path}")
+    try:
+        if args.list or not args.folder:
+            for folder in sinks.list_bundles(path):
+                print(folder)
+            return 0
+        folder = sinks.materialize(path, args.folder, _parse_path(args.dir))
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    print(f"Created: {folder}")
+    if _open_in_vscode(folder):
+        print("Opened in VS Code")
+    return 0
+
+
+def _cmd_list(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py list", description="List job folders from manifest.jsonl.")
+    parser.add_argument("--dir", default=".", help="Folder holding manifest.jsonl (default: cwd)")
+    parser.add_argument("--company", help="Only postings whose company contains this text")
+    parser.add_argument("--since", metavar="YYYY-MM[-DD]", help="Only folders created on or after this date")
+    parser.add_argument("--json", action="store_true", help="Print manifest entries as JSON lines")
+    args = parser.parse_args(argv)
+    import json
+
+    import layout
+
+    base_dir = _parse_path(args.dir)
+    if not layout.Manifest.exists(base_dir):
+        parser.error(f"No {layout.MANIFEST_NAME} in {base_dir}; create folders with --layout first")
+    company = (args.company or "").casefold()
+    shown = 0
+    for e in layout.Manifest(base_dir).entries():
+        if company and company not in (e.get("company") or "").casefold():
+            continue
+        if args.since and (e.get("created") or "") < args.since:
+            continue
+        shown += 1
+        if args.json:
+            print(json.dumps(e, ensure_ascii=False))
+        else:
+            label = " @ ".join(x for x in (e.get("title"), e.get("company")) if x)
+            print(f"{(e.get('created') or '')[:10]:10}  {e['folder']}" + (f"  ({label})" if label else ""))
+    return 0 if shown else 1
+
+
+def _cmd_rerender(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="job_tool.py rerender",
+                                     description="Regenerate prompts in every job folder from its description and the current templates.")
+    parser.add_argument("root", nargs="?", default=".", help="Directory containing job folders (default: cwd)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    lang = parser.add_mutually_exclusive_group()
+    lang.add_argument("-vf", action="store_true", help="Use the French templates for every folder")
+    lang.add_argument("--english", action="store_true", help="Use the English templates for every folder")
+    fill = parser.add_mutually_exclusive_group()
+    fill.add_argument("--fill", action="store_true", help="Put each folder's title and company into the prompts")
+    fill.add_argument("--no-fill", action="store_true", help="Leave [TITLE] and [COMPANY] as the templates have them")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args(argv)
+    import time
+
+    import rerender
+
+    t0 = time.perf_counter()
+    results = rerender.rerender(_parse_path(args.root), workers=args.jobs,
+                                french=True if args.vf else False if args.english else None, dry_run=args.dry_run,
+                                fill=True if args.fill else False if args.no_fill else None)
+    elapsed = time.perf_counter() - t0
+    counts, files = {}, 0
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+        if r["status"] == "failed":
+            print(f"Failed: {r['folder']}: {r['error']}", file=sys.stderr)
+        elif r["status"] == "updated":
+            files += len(r["files"])
+            print(f"{'Would update' if args.dry_run else 'Updated'}: {r['folder']} ({', '.join(r['files'])})")
+    if not results:
+        print("No job folders found")
+        return 0
+    summary = ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+    print(f"{summary}; {files} files {'to write' if args.dry_run else 'written'}; "
+          f"{len(results)} folders in {elapsed:.2f} s ({len(results) / max(elapsed, 1e-9):.0f}/s)")
+    return 1 if counts.get("failed") else 0
+
+
+_COMMANDS = {
+    "build-all": _cmd_build_all,
+    "rerender": _cmd_rerender,
+    "list": _cmd_list,
+    "materialize": _cmd_materialize,
+    "search": _cmd_search,
+    "rank": _cmd_rank,
+    "replay": _cmd_replay,
+    "ingest": _cmd_ingest,
+    "watch": _cmd_watch,
+    "serve": _cmd_serve,
+}
+
+
+def _is_tex(target):
+    return target.lower().endswith(".tex") and not target.lower().startswith(("http://", "https://"))
+
+
+def _build_tex(target, use_format):
+    try:
+        pdf = _compile_resume(target, use_format=use_format)
+    except Exception as e:
+        raise SystemExit(str(e)) from e
+    print(f"Created: {pdf}")
+
+
+def _fast_tex(argv):
+    # `job_tool.py Resume.tex [--no-format]` from save hooks skips argparse.
+    paths = [a for a in argv if not a.startswith("-")]
+    flags = set(argv) - set(paths)
+    if len(paths) != 1 or flags - {"--no-format"} or not _is_tex(paths[0].strip()):
+        return False
+    _build_tex(paths[0].strip(), use_format="--no-format" not in flags)
+    return True
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in _COMMANDS:
+        raise SystemExit(_COMMANDS[sys.argv[1]](sys.argv[2:]))
+    if _fast_tex(sys.argv[1:]):
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(description="Create job folder from posting URL or compile .tex resume.")
     parser.add_argument("url", nargs="?", help="Job posting URL or .tex file path")
     parser.add_argument("-vf", action="store_true", help="French mode")
+    parser.add_argument("--batch", metavar="FILE", help="File of URLs, one per line ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent fetches in batch mode")
+    parser.add_argument("--procs", type=int, default=None, help="Parser processes in batch mode (default: CPU count)")
+    parser.add_argument("--summary", metavar="FILE", help="Write the batch JSONL summary here instead of stdout")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk HTTP cache")
+    parser.add_argument("--offline", action="store_true", help="Serve pages only from the HTTP cache")
+    parser.add_argument("--cache-ttl", type=int, default=3600, help="Seconds before a cached page is revalidated")
+    parser.add_argument("--no-format", action="store_true", help="Compile .tex without the precompiled preamble format")
+    parser.add_argument("--save-cookies", action="store_true", help="Write updated cookies back to cookies.txt")
+    parser.add_argument("--no-archive", action="store_true", help="Don't keep fetched pages in the page archive")
+    parser.add_argument("--no-index", action="store_true", help="Process the posting even if already seen")
+    _add_fill_arg(parser)
+    _add_layout_arg(parser)
+    _add_sink_arg(parser)
+    _add_timing_args(parser)
     args = parser.parse_args()
+    if args.no_cache and args.offline:
+        parser.error("--offline needs the cache; drop --no-cache.")
+
+    _start_timings(args)
+    try:
+        _run(args, parser)
+    finally:
+        _finish_timings(args)
+
+
+def _run(args, parser):
+    if args.batch:
+        raise SystemExit(_run_batch(args))
 
     target = (args.url or "").strip()
     if not target:
@@ -82,20 +613,28 @@ def main():
         parser.error("URL or .tex path required.")
 
     # .tex file → compile PDF
-    if target.lower().endswith(".tex") and not target.lower().startswith(("http://", "https://")):
-        try:
-            pdf = _compile_resume(target)
-        except Exception as e:
-            raise SystemExit(str(e)) from e
-        print(f"Created: {pdf}")
+    if _is_tex(target):
+        _build_tex(target, use_format=not args.no_format)
         return
 
     # URL → scrape and process
-    job = scraper.scrape_job(target)
-    result = processor.process_job(job, Path.cwd(), target, french=args.vf)
+    import job_index
+    import processor
+    import scraper
+
+    index = _make_index(args)
+    try:
+        with scraper.new_session(save_cookies=args.save_cookies, archive=_make_archive(args)) as session:
+            job = scraper.scrape_job(target, _make_cache(args), session, index)
+        with _make_sink(args) as sink:
+            result = processor.process_job(job, Path.cwd(), target, french=args.vf, index=index,
+                                           manifest=_make_manifest(args, Path.cwd()), sink=sink, fill=args.fill)
+    except job_index.Duplicate as e:
+        print(f"Skipped: {e}")
+        return
 
     print(f"Created: {result['folder_path']}")
-    if _open_in_vscode(result["folder_path"]):
+    if isinstance(result["folder_path"], Path) and _open_in_vscode(result["folder_path"]):
         print("Opened in VS Code")
     if tpl := result.get("resume_template_path"):
         print(f"Template: {tpl}")
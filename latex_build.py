@@ -0,0 +1,262 @@
+"""Resume PDF builds: single compiles and an incremental build of many folders."""
+
+import hashlib
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+
+import timings
+
+STEM = "Resume"
+STAMP = f".{STEM}.build"
+
+_BASE = Path(__file__).parent
+FORMAT_DIR = _BASE / ".cache" / "latex"
+_SKIP_DIRS = {_BASE / "templates", _BASE / "templates_vf"}
+_AUX = (".aux", ".log", ".out", ".toc", ".nav", ".snm", ".fls", ".fdb_latexmk", ".synctex.gz")
+_MAX_RUNS = 3
+_RERUN_RE = re.compile(r"Rerun to get|Please rerun LaTeX|Rerun LaTeX", re.I)
+_DEP_RE = re.compile(r"\\(?:input|include|documentclass|usepackage|bibliography)\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}")
+_DEP_EXTS = ("", ".tex", ".cls", ".sty", ".bib")
+_BEGIN_DOC = "\\begin{document}"
+_format_lock = threading.Lock()
+_engine = None
+
+
+def cleanup_aux(directory, stem=STEM):
+    for ext in _AUX:
+        try:
+            (directory / f"{stem}{ext}").unlink()
+        except OSError:
+            pass
+
+
+def _run_pdflatex(args, cwd, env=None):
+    try:
+        with timings.span("pdflatex", ini="-ini" in args, warm=any(a.startswith("-fmt=") for a in args)):
+            return subprocess.run(["pdflatex", "-interaction=nonstopmode", *args], cwd=cwd, capture_output=True, text=True, env=env)
+    except FileNotFoundError:
+        raise RuntimeError("pdflatex not found. Install TeX Live.") from None
+
+
+def _split_preamble(text):
+    i = text.find(_BEGIN_DOC)
+    if i < 0:
+        return None, text
+    return text[:i], text[i:]
+
+
+def _engine_stamp():
+    # What a dumped format depends on besides its preamble: the pdflatex
+    # binary and the base pdflatex.fmt it was loaded from. Worked out once.
+    global _engine
+    if _engine is None:
+        import shutil
+
+        try:
+            base = subprocess.run(["kpsewhich", "-engine=pdftex", "pdflatex.fmt"], capture_output=True,
+                                  text=True).stdout.strip()
+        except OSError:
+            base = ""
+        lines = []
+        for p in (shutil.which("pdflatex"), base):
+            try:
+                st = os.stat(p)
+            except (OSError, TypeError, ValueError):
+                continue
+            lines.append(f"{os.path.realpath(p)} {st.st_size} {st.st_mtime_ns}\n")
+        _engine = "".join(lines)
+    return _engine
+
+
+def format_for(preamble):
+    """Return a cached .fmt with PREAMBLE dumped into it, building it if needed.
+
+    Returns None when the preamble can't be dumped; that outcome is cached too
+    so later builds go straight to a normal compile. Both outcomes are kept
+    only while pdflatex and its base format are the ones recorded next to
+    them, so a TeX update gets a fresh dump on either route.
+    """
+    name = "preamble-" + hashlib.sha256(preamble.encode("utf-8")).hexdigest()[:20]
+    fmt, failed = FORMAT_DIR / f"{name}.fmt", FORMAT_DIR / f"{name}.failed"
+    stamp = FORMAT_DIR / f"{name}.engine"
+    with _format_lock:
+        engine = _engine_stamp()
+        if fmt.is_file() or failed.is_file():
+            try:
+                current = stamp.read_text(encoding="utf-8") == engine
+            except OSError:
+                current = False
+            if current:
+                return fmt if fmt.is_file() else None
+            fmt.unlink(missing_ok=True)
+            failed.unlink(missing_ok=True)
+        FORMAT_DIR.mkdir(parents=True, exist_ok=True)
+        src = FORMAT_DIR / f"{name}.tex"
+        src.write_text(preamble + "\n\\dump\n", encoding="utf-8")
+        tmp = f"{name}-{os.getpid()}"
+        result = _run_pdflatex(["-ini", f"-jobname={tmp}", "&pdflatex", src.name], FORMAT_DIR)
+        built = FORMAT_DIR / f"{tmp}.fmt"
+        for ext in (".log", ".aux"):
+            (FORMAT_DIR / f"{tmp}{ext}").unlink(missing_ok=True)
+        stamp.write_text(engine, encoding="utf-8")
+        if result.returncode != 0 or not built.is_file():
+            built.unlink(missing_ok=True)
+            failed.write_text(result.stdout[-4000:], encoding="utf-8")
+            return None
+        os.replace(built, fmt)
+        return fmt
+
+
+def _warm_source(path, stem):
+    # Use a preamble format only when the preamble has no folder-local
+    # inputs, since one format is shared by every folder with that preamble.
+    text = path.read_text(encoding="utf-8", errors="replace")
+    preamble, body = _split_preamble(text)
+    if not preamble or _dependencies(path, preamble, globs=False):
+        return None
+    fmt = format_for(preamble)
+    if fmt is None:
+        return None
+    body_path = path.parent / f".{stem}-body.tex"
+    body_path.write_text(body, encoding="utf-8")
+    env = dict(os.environ, TEXFORMATS=f"{fmt.parent}{os.pathsep}")
+    return [f"-fmt={fmt.stem}", f"-jobname={stem}", body_path.name], env, body_path, fmt
+
+
+def _discard_format(fmt, reason):
+    with _format_lock:
+        fmt.unlink(missing_ok=True)
+        fmt.with_suffix(".failed").write_text(reason[-4000:], encoding="utf-8")
+
+
+def _passes(args, folder, stem, env=None):
+    for _ in range(_MAX_RUNS):
+        result = _run_pdflatex(args, folder, env)
+        if result.returncode != 0:
+            return result
+        if not _needs_rerun(folder, stem):
+            break
+    return result
+
+
+def _needs_rerun(directory, stem):
+    try:
+        log = (directory / f"{stem}.log").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return False
+    return bool(_RERUN_RE.search(log))
+
+
+@timings.timed("compile_resume")
+def compile_tex(path, stem=STEM, use_format=True):
+    path = Path(path)
+    if path.suffix.lower() != ".tex" or not path.is_file():
+        raise ValueError(f"Invalid .tex file: {path}")
+
+    folder = path.parent
+    cleanup_aux(folder, stem)
+    # Start from the previous build's .aux so references resolve on the first
+    # pass; extra passes run only when the log asks for them.
+    stash = folder / f".{stem}.aux"
+    if stash.is_file():
+        os.replace(stash, folder / f"{stem}.aux")
+    ok = False
+    warm = _warm_source(path, stem) if use_format else None
+    try:
+        warm_result = _passes(warm[0], folder, stem, warm[1]) if warm else None
+        result = warm_result
+        if result is None or result.returncode != 0:
+            # No format, or the warm build failed: compile from scratch, and
+            # retire the format if it was the only thing at fault.
+            result = _passes([f"-jobname={stem}", path.name], folder, stem)
+            if warm and result.returncode == 0:
+                _discard_format(warm[3], warm_result.stdout)
+        if result.returncode != 0:
+            raise RuntimeError(f"pdflatex failed:\n{result.stdout}")
+        ok = True
+    finally:
+        if warm:
+            warm[2].unlink(missing_ok=True)
+        if ok and (folder / f"{stem}.aux").is_file():
+            os.replace(folder / f"{stem}.aux", stash)
+        cleanup_aux(folder, stem)
+
+    return path.parent / f"{stem}.pdf"
+
+
+def _dependencies(path, text, globs=True):
+    deps = set()
+    for m in _DEP_RE.finditer(text):
+        for name in m.group(1).split(","):
+            name = name.strip()
+            for ext in _DEP_EXTS:
+                dep = path.parent / f"{name}{ext}"
+                if name and dep.is_file():
+                    deps.add(dep)
+    for pattern in ("*.cls", "*.sty", "*.bst") if globs else ():
+        deps.update(path.parent.glob(pattern))
+    deps.discard(path)
+    return sorted(deps)
+
+
+def source_hash(path):
+    text = path.read_text(encoding="utf-8", errors="replace")
+    h = hashlib.sha256(text.encode("utf-8"))
+    for dep in _dependencies(path, text):
+        h.update(b"\0" + dep.name.encode("utf-8") + b"\0" + dep.read_bytes())
+    return h.hexdigest()
+
+
+def is_current(path, digest, stem=STEM):
+    folder = path.parent
+    if not (folder / f"{stem}.pdf").is_file():
+        return False
+    try:
+        return (folder / STAMP).read_text(encoding="utf-8").strip() == digest
+    except OSError:
+        return False
+
+
+def find_sources(root):
+    by_folder = {}
+    for tex in Path(root).rglob("*.tex"):
+        rel = tex.relative_to(root).parts
+        if any(p.startswith(".") for p in rel) or any(d in tex.parents for d in _SKIP_DIRS):
+            continue
+        by_folder.setdefault(tex.parent, []).append(tex)
+    for folder in sorted(by_folder):
+        texs = sorted(by_folder[folder])
+        if len(texs) > 1:
+            # Several sources would all compete for the same Resume.pdf.
+            texs = [t for t in texs if t.name == "resume-template.tex"] or texs
+        yield texs[0] if len(texs) == 1 else None, folder
+
+
+def _build_one(path, force, use_format):
+    try:
+        digest = source_hash(path)
+        if not force and is_current(path, digest):
+            return {"tex": str(path), "status": "current"}
+        pdf = compile_tex(path, use_format=use_format)
+        (path.parent / STAMP).write_text(digest + "\n", encoding="utf-8")
+        return {"tex": str(path), "status": "built", "pdf": str(pdf)}
+    except Exception as e:
+        return {"tex": str(path), "status": "failed", "error": str(e)}
+
+
+def build_all(root, workers=None, force=False, use_format=True):
+    # Threads are enough: the work happens in pdflatex child processes.
+    from concurrent.futures import ThreadPoolExecutor
+
+    jobs, results = [], []
+    for tex, folder in find_sources(root):
+        if tex is None:
+            results.append({"tex": str(folder), "status": "failed", "error": "Several .tex files; rename extras."})
+        else:
+            jobs.append(tex)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        results.extend(pool.map(lambda p: _build_one(p, force, use_format), jobs))
+    return results
@@ -0,0 +1,231 @@
+"""Sharded job folder layout with a manifest of every posting.
+
+``manifest.jsonl`` in the base directory holds one JSON line per job folder:
+its path, the posting's title, company, URL and key, and when it was made.
+Folder names are claimed against the manifest, so two different postings
+that map to the same name get ``Name``, ``Name-2``, ... without probing the
+filesystem, and listings read this one file instead of walking the tree.
+A ``{"layout": ...}`` line records the shard scheme; later runs keep it,
+and a ``{"folder": ..., "moved_to": ...}`` line retires a renamed folder.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: the thread lock still covers one process
+    fcntl = None
+
+MANIFEST_NAME = "manifest.jsonl"
+LAYOUTS = ("flat", "company", "month", "month/company")
+
+
+def posting_key(job, url=None):
+    """What makes two postings the same: the canonical URL, else the content hash."""
+    if url:
+        from http_cache import canonical_url
+
+        return "url:" + canonical_url(url)
+    from job_index import content_hash
+
+    return "hash:" + content_hash(job)
+
+
+def _shard(layout, company, month):
+    from processor import company_slug, safe_slug
+
+    if layout == "flat":
+        return ""
+    slug = safe_slug(company_slug(company)[:40].strip("-")) if layout != "month" else ""
+    return {"company": slug, "month": month, "month/company": f"{month}/{slug}"}[layout]
+
+
+class Manifest:
+    def __init__(self, base_dir, layout=None):
+        self.base_dir = Path(base_dir)
+        self.path = self.base_dir / MANIFEST_NAME
+        self.layout = "flat"
+        self._entries = {}  # folder (relative, "/"-separated) -> entry
+        self._by_key = {}  # posting key -> folder
+        self._next = {}  # unsuffixed folder -> next free suffix
+        self._offset = 0
+        self._lock = threading.Lock()
+        if layout and layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {layout!r}; choose from {', '.join(LAYOUTS)}")
+        with self._locked() as f:
+            if self._offset == 0:
+                self._adopt(f)
+            if layout and layout != self.layout:
+                self._append(f, {"layout": layout})
+
+    @staticmethod
+    def exists(base_dir):
+        return (Path(base_dir) / MANIFEST_NAME).is_file()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+", encoding="utf-8") as f:
+                if fcntl:
+                    # Serializes claims across processes too (batch, serve, ingest).
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                self._catch_up(f)
+                yield f
+
+    def _catch_up(self, f):
+        # Pick up lines other processes appended since the last look.
+        f.seek(self._offset)
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            self._offset += len(line.encode("utf-8"))
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def _apply(self, e):
+        if "layout" in e:
+            self.layout = e["layout"]
+            return
+        if "moved_to" in e:
+            self._entries.pop(e["folder"], None)
+            return
+        folder = e["folder"]
+        self._entries[folder] = e
+        if e.get("key"):
+            self._by_key[e["key"]] = folder
+        parent, _, last = folder.rpartition("/")
+        if last != e["name"]:
+            base = f"{parent}/{e['name']}" if parent else e["name"]
+            self._next[base] = max(self._next.get(base, 2), int(last[len(e["name"]) + 1:]) + 1)
+
+    def _append(self, f, e):
+        line = json.dumps(e, ensure_ascii=False) + "\n"
+        f.seek(0, os.SEEK_END)
+        f.write(line)
+        f.flush()
+        self._offset += len(line.encode("utf-8"))
+        self._apply(e)
+
+    def _adopt(self, f):
+        # First manifest in a directory that already has folders: record them once.
+        for folder, txt, st in walk_description_files(self.base_dir):
+            name = os.path.basename(folder)
+            source = None
+            with open(txt, encoding="utf-8", errors="replace") as t:
+                first = t.readline()
+            if first.startswith("Source:"):
+                source = first[len("Source:"):].strip() or None
+            rel = Path(os.path.relpath(folder, self.base_dir)).as_posix()
+            self._append(f, {"folder": rel, "name": name, "file": f"{name}.txt", "url": source,
+                             "key": posting_key(None, source) if source else None,
+                             "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(st.st_mtime))})
+
+    def _known(self, key, folder_name):
+        e = self._entries.get(self._by_key.get(key))
+        return e["folder"] if e and e["name"] == folder_name else None
+
+    def claim(self, job, folder_name, url=None):
+        """Return this posting's folder, relative to the base directory, recording it if it's new.
+
+        The same posting (URL, else content) under the same name gets its
+        existing folder back; a different posting gets the next free suffix.
+        """
+        key = posting_key(job, url)
+        with self._locked() as f:
+            if known := self._known(key, folder_name):
+                return known
+            now = time.localtime()
+            shard = _shard(self.layout, job.get("company") or "", time.strftime("%Y-%m", now))
+            base = f"{shard}/{folder_name}" if shard else folder_name
+            folder = base
+            if folder in self._entries:
+                n = self._next.get(base, 2)
+                while f"{base}-{n}" in self._entries:
+                    n += 1
+                folder = f"{base}-{n}"
+            self._append(f, {"folder": folder, "name": folder_name, "file": f"{folder_name}.txt",
+                             "title": job.get("title"), "company": job.get("company"), "url": url, "key": key,
+                             "created": time.strftime("%Y-%m-%dT%H:%M:%S", now)})
+        return folder
+
+    def find(self, job, folder_name, url=None):
+        """The folder claim() would reuse for this posting, or None if it would make a new one."""
+        with self._locked():
+            if known := self._known(posting_key(job, url), folder_name):
+                return self.base_dir / known
+        return None
+
+    def lookup(self, url):
+        """The entry of URL's posting under whatever name it was last claimed, or None."""
+        with self._locked():
+            folder = self._by_key.get(posting_key(None, url))
+            return self._entries.get(folder) if folder else None
+
+    def moved(self, old, new):
+        """Retire folder OLD, renamed to NEW (both relative; NEW already claimed)."""
+        with self._locked() as f:
+            self._append(f, {"folder": old, "moved_to": new})
+
+    def entries(self):
+        """Manifest entries in the order the folders were made."""
+        with self._locked():
+            return list(self._entries.values())
+
+
+def description_files(base_dir):
+    """(folder, description path, stat) for every job folder under BASE_DIR.
+
+    Read from the manifest when there is one, else found by walk_description_files.
+    """
+    if Manifest.exists(base_dir):
+        return _manifest_description_files(base_dir)
+    return walk_description_files(base_dir)
+
+
+def walk_description_files(root, depth=2):
+    """(folder, ``<folder>/<folder>.txt``, stat) for job folders directly under ROOT or in shard directories."""
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith(".") or not entry.is_dir(follow_symlinks=False):
+            continue
+        txt = os.path.join(entry.path, entry.name + ".txt")
+        try:
+            st = os.stat(txt)
+        except OSError:
+            if depth > 1:
+                yield from walk_description_files(entry.path, depth - 1)
+            continue
+        yield entry.path, txt, st
+
+
+def _manifest_description_files(base_dir):
+    # Every manifest entry, without walking the tree.
+    files = {}
+    with open(Path(base_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+        for line in f:
+            try:
+                e = json.loads(line)
+                if "moved_to" in e:
+                    files.pop(e["folder"], None)
+                    continue
+                files[e["folder"]] = e["file"]
+            except (ValueError, KeyError, TypeError):
+                continue
+    for folder, name in files.items():
+        full = os.path.join(base_dir, *folder.split("/"))
+        txt = os.path.join(full, name)
+        try:
+            yield full, txt, os.stat(txt)
+        except OSError:
+            continue  # folder deleted by hand
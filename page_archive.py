@@ -0,0 +1,135 @@
+"""Append-only archive of fetched pages as WARC response records.
+
+Each record is its own gzip member in ``pages-NNNNN.warc.gz``, so any record
+can be read by seeking to its offset; ``index.jsonl`` lists the URL, segment,
+offset and length of every record in the order they were written. The
+compression, spooling and header modules are imported on first use, so
+opening an archive costs nothing on routes that never fetch.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from http_cache import CACHE_ROOT
+
+try:
+    import fcntl
+except ImportError:  # Windows: the thread lock still covers one process
+    fcntl = None
+
+ARCHIVE_DIR = CACHE_ROOT / "archive"
+SEGMENT_BYTES = 512 * 1024 * 1024
+
+# The body is stored decoded, so transport headers that describe the wire form are dropped.
+_WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _http_block(status, headers, size):
+    lines = [f"HTTP/1.1 {status}"]
+    for k, v in (headers.items() if headers else ()):
+        if k.lower() not in _WIRE_HEADERS:
+            lines.append(f"{k}: {' '.join(str(v).split())}")
+    lines.append(f"Content-Length: {size}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8", "replace")
+
+
+def _warc_header(url, date, digest, length):
+    import uuid
+
+    fields = [
+        "WARC/1.1",
+        "WARC-Type: response",
+        f"WARC-Target-URI: {url}",
+        f"WARC-Date: {date}",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Payload-Digest: sha256:{digest}",
+        "Content-Type: application/http; msgtype=response",
+        f"Content-Length: {length}",
+    ]
+    return ("\r\n".join(fields) + "\r\n\r\n").encode("utf-8")
+
+
+class PageArchive:
+    def __init__(self, directory=ARCHIVE_DIR, segment_bytes=SEGMENT_BYTES):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.index_path = self.directory / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def append(self, url, headers, body, status=200):
+        """Store BODY (decoded bytes) fetched from URL and return its index entry."""
+        import gzip
+        from datetime import datetime, timezone
+
+        date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        digest = hashlib.sha256(body).hexdigest()
+        block = _http_block(status, headers, len(body))
+        member = gzip.compress(_warc_header(url, date, digest, len(block) + len(body)) + block + body + b"\r\n\r\n",
+                               compresslevel=6, mtime=0)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.index_path, "a", encoding="utf-8") as index:
+            if fcntl:
+                # Serializes writers across processes too (batch, serve, ingest).
+                fcntl.flock(index, fcntl.LOCK_EX)
+            segment = self._segment()
+            with open(self.directory / segment, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(member)
+            entry = {"url": url, "date": date, "status": status, "sha256": digest, "size": len(body),
+                     "segment": segment, "offset": offset, "length": len(member)}
+            index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    @contextmanager
+    def writer(self, url, headers, status=200):
+        """Collect a streamed body and archive it once the block completes."""
+        import tempfile
+
+        with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) as spool:
+            yield spool
+            spool.seek(0)
+            self.append(url, headers, spool.read(), status)
+
+    def _segment(self):
+        existing = sorted(self.directory.glob("pages-*.warc.gz"))
+        if existing and existing[-1].stat().st_size < self.segment_bytes:
+            return existing[-1].name
+        n = int(existing[-1].name[6:11]) + 1 if existing else 1
+        return f"pages-{n:05d}.warc.gz"
+
+    def entries(self, latest=True):
+        """Index entries in write order; with LATEST only the newest per URL."""
+        out = {} if latest else []
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        e = json.loads(line)
+                    except ValueError:
+                        continue
+                    if latest:
+                        out.pop(e["url"], None)
+                        out[e["url"]] = e
+                    else:
+                        out.append(e)
+        except FileNotFoundError:
+            pass
+        return list(out.values()) if latest else out
+
+    def read(self, entry):
+        """Return (url, headers, body) for an index entry."""
+        import gzip
+        from email.parser import BytesHeaderParser
+
+        with open(self.directory / entry["segment"], "rb") as f:
+            f.seek(entry["offset"])
+            record = gzip.decompress(f.read(entry["length"]))
+        _, _, rest = record.partition(b"\r\n\r\n")
+        head, _, rest = rest.partition(b"\r\n\r\n")
+        headers = BytesHeaderParser().parsebytes(head.partition(b"\r\n")[2])
+        return entry["url"], headers, rest[:entry["size"]]
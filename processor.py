@@ -1,21 +1,27 @@
 """Process job data into folder structure with templates."""
 
+import json
 import os
 import re
 from pathlib import Path
 
 import file_ops
 import prompt_creator
+import timings
 
 _TEMPLATES = Path(__file__).parent / "templates"
 _TEMPLATES_VF = Path(__file__).parent / "templates_vf"
+# Title, company and prompt language as written, so rerender and replay
+# never have to guess them back from the prompts.
+JOB_FILE = ".job.json"
 
 _WIN_RESERVED = {"CON", "PRN", "AUX", "NUL"} | {f"{p}{n}" for p in ("COM", "LPT") for n in range(1, 10)}
 
 _NOISE = {"webkit", "inline", "block", "flex", "display", "margin", "padding", "color", "inherit", "auto", "rem", "em", "px"}
 
 
-def _words(text):
+def words(text):
+    """The runs of ASCII letters and digits in TEXT; folder names, search and rank all split text this way."""
     return [w for w in re.sub(r"[^A-Za-z0-9]+", " ", text or "").split() if w]
 
 
@@ -31,13 +37,13 @@ def _is_noise(w):
 
 
 def _abbrev(title, max_len=4):
-    return "-".join(w[:max_len] if len(w) > max_len else w for w in _words(title))
+    return "-".join(w[:max_len] if len(w) > max_len else w for w in words(title))
 
 
-def _company_slug(company):
-    words = _words(company)
+def company_slug(company):
+    parts = words(company)
     result = []
-    for w in words:
+    for w in parts:
         if _is_noise(w):
             if result:
                 break
@@ -45,7 +51,7 @@ def _company_slug(company):
         result.append(w)
         if len(result) >= 6:
             break
-    return "-".join(result or words[:4])
+    return "-".join(result or parts[:4])
 
 
 def _trim(slug, max_len=80):
@@ -61,7 +67,7 @@ def _trim(slug, max_len=80):
     return acc.strip("-") or slug[:max_len].rstrip("-")
 
 
-def _safe_slug(slug):
+def safe_slug(slug):
     slug = slug.strip(" .")
     if not slug:
         return "Job-Posting"
@@ -71,12 +77,17 @@ def _safe_slug(slug):
 
 
 def make_folder_name(title, company):
-    t, c = _abbrev(title), _company_slug(company)
+    t, c = _abbrev(title), company_slug(company)
     slug = f"{t}-{c}" if t and c else t or c or "Job-Posting"
-    return _trim(_safe_slug(slug))
+    return _trim(safe_slug(slug))
 
 
-def process_job(job_data, base_dir, source_url=None, french=False):
+def render_job(job_data, source_url=None, french=False, fill=False):
+    """Return the folder name and the text of every file process_job would write.
+
+    With FILL the prompts get the posting's title and company in place of
+    ``[TITLE]`` and ``[COMPANY]``; by default the templates are used as written.
+    """
     title = (job_data.get("title") or "").strip()
     company = (job_data.get("company") or "").strip()
     desc = (job_data.get("description") or "").strip() or "Description not found."
@@ -85,15 +96,77 @@ def process_job(job_data, base_dir, source_url=None, french=False):
         raise ValueError("Job title or company missing.")
 
     folder_name = make_folder_name(title, company)
-    folder = file_ops.ensure_job_folder(base_dir, folder_name)
+    # Wrap once; the description file and both prompts share this text.
+    with timings.span("wrap", bytes=len(desc)):
+        wrapped = file_ops.wrap(desc)
+
+    return {
+        "folder_name": folder_name,
+        "files": {
+            f"{folder_name}.txt": file_ops.description_text(wrapped, source_url=source_url, prewrapped=True),
+            **render_prompts(wrapped, french, {"title": title, "company": company} if fill else None),
+            JOB_FILE: job_file_text(title, company, french, fill),
+        },
+    }
+
+
+def job_file_text(title, company, french, fill=False):
+    return json.dumps({"title": title, "company": company, "french": bool(french), "fill": bool(fill)},
+                      ensure_ascii=False) + "\n"
+
 
+def read_job_file(folder):
+    """The JOB_FILE record of FOLDER, or None for a folder made before it existed."""
+    try:
+        with open(os.path.join(folder, JOB_FILE), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def render_prompts(wrapped, french=False, values=None):
+    """prompt.txt and prompt-cover.txt for an already wrapped description.
+
+    VALUES fills ``[KEY]`` placeholders (``{"company": ...}``); without it
+    the templates are used as written.
+    """
+    main_prompt = prompt_creator.render_main_prompt(french, **(values or {}))
+    cover_prompt = prompt_creator.render_cover_prompt(french, **(values or {}))
+    return {
+        "prompt.txt": file_ops.prompt_text(main_prompt, wrapped, prewrapped=True),
+        "prompt-cover.txt": file_ops.prompt_text(cover_prompt, wrapped, prewrapped=True),
+    }
+
+
+@timings.timed("process_job")
+def process_job(job_data, base_dir, source_url=None, french=False, index=None, manifest=None, sink=None, fill=False):
+    """Write the posting's bundle to SINK (default: a real folder under BASE_DIR).
+
+    JOB_DATA is a ``job_posting.JobPosting`` or a dict with the same keys.
+    With an archive or database sink the returned locations are
+    ``<sink file>::<folder>[/<file>]`` strings instead of paths.
+    """
+    rendered = render_job(job_data, source_url, french, fill)
+    # A repost of a known posting raises job_index.Duplicate instead of being rewritten.
+    digest = index.check_content(job_data, source_url) if index else None
+    folder_name, files = rendered["folder_name"], rendered["files"]
+    # Sharded path, and a -2, -3... suffix when another posting has the name.
+    rel = manifest.claim(job_data, folder_name, source_url) if manifest else folder_name
     tpl_dir = _TEMPLATES_VF if french else _TEMPLATES
+    if sink is None:
+        from sinks import DirSink
+
+        sink = DirSink(base_dir)
+    folder, paths, template = sink.write(rel, files, tpl_dir / "resume-template.tex")
+    if index:
+        index.add(job_data, folder.resolve() if isinstance(folder, Path) else folder, source_url, digest)
 
     return {
         "folder_name": folder_name,
         "folder_path": folder,
-        "file_path": file_ops.write_description(folder, f"{folder_name}.txt", desc, source_url=source_url),
-        "prompt_path": file_ops.write_prompt_file(folder, "prompt.txt", prompt_creator.get_main_prompt(french), desc),
-        "cover_prompt_path": file_ops.write_prompt_file(folder, "prompt-cover.txt", prompt_creator.get_cover_prompt(french), desc),
-        "resume_template_path": file_ops.copy_template(tpl_dir / "resume-template.tex", folder),
+        "file_path": paths[0],
+        "prompt_path": paths[1],
+        "cover_prompt_path": paths[2],
+        "resume_template_path": template,
     }
@@ -1,21 +1,86 @@
-"""Template loading for prompts."""
+"""Template loading for prompts.
 
+Templates are read once and kept with their wrapped form; a changed mtime or
+size on disk reloads them on the next call.
+"""
+
+import re
 from pathlib import Path
 
+import file_ops
+
 _BASE = Path(__file__).parent
 _TPL = _BASE / "templates"
 _TPL_VF = _BASE / "templates_vf"
 
+_PLACEHOLDER_RE = re.compile(r"\[([A-Z][A-Z_]*)\]")
+_OPENING_WORDS = 8
+_cache = {}
+
+
+class _Template:
+    __slots__ = ("stamp", "text", "_compiled")
+
+    def __init__(self, stamp, text):
+        self.stamp, self.text, self._compiled = stamp, text, {}
+
+    def _lines(self, width):
+        # Per source line: its wrapped text, or None when it holds a
+        # placeholder and has to be wrapped after substitution.
+        compiled = self._compiled.get(width)
+        if compiled is None:
+            compiled = [
+                (None if _PLACEHOLDER_RE.search(raw) else file_ops.wrap(raw, width), raw)
+                for raw in self.text.splitlines()
+            ]
+            self._compiled[width] = compiled
+        return compiled
+
+    def render(self, width=80, **values):
+        """Return the template wrapped to WIDTH with [KEY] placeholders filled from VALUES."""
+        values = {k.upper(): " ".join(str(v).split()) for k, v in values.items() if v}
+        sub = lambda m: values.get(m.group(1), m.group(0))  # noqa: E731
+        parts = []
+        for wrapped, raw in self._lines(width):
+            parts.append(wrapped if wrapped is not None else file_ops.wrap(_PLACEHOLDER_RE.sub(sub, raw), width))
+        return "\n".join(parts)
+
 
-def _read(path):
-    if not path.exists():
-        raise FileNotFoundError(f"Template not found: {path}")
-    return path.read_text(encoding="utf-8").strip()
+def load(name, french=False):
+    path = (_TPL_VF if french else _TPL) / name
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Template not found: {path}") from None
+    stamp = (st.st_mtime_ns, st.st_size)
+    tpl = _cache.get(path)
+    if tpl is None or tpl.stamp != stamp:
+        # A racing reload just stores an identical entry.
+        tpl = _cache[path] = _Template(stamp, path.read_text(encoding="utf-8").strip())
+    return tpl
 
 
 def get_main_prompt(french=False):
-    return _read((_TPL_VF if french else _TPL) / "prompt-template.txt")
+    return load("prompt-template.txt", french).text
 
 
 def get_cover_prompt(french=False):
-    return _read((_TPL_VF if french else _TPL) / "cover-letter-template.txt")
+    return load("cover-letter-template.txt", french).text
+
+
+def render_main_prompt(french=False, width=80, **values):
+    return load("prompt-template.txt", french).render(width, **values)
+
+
+def render_cover_prompt(french=False, width=80, **values):
+    return load("cover-letter-template.txt", french).render(width, **values)
+
+
+def prompt_language(prompt):
+    """True (French) or False (English) when PROMPT opens like exactly one main template, else None."""
+    def opening(text):
+        return text.split(None, _OPENING_WORDS)[:_OPENING_WORDS]
+
+    words = opening(prompt or "")
+    matches = [fr for fr in (False, True) if words == opening(get_main_prompt(fr))]
+    return matches[0] if len(matches) == 1 else None
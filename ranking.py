@@ -0,0 +1,192 @@
+"""Rank job folders by TF-IDF cosine similarity to a resume.
+
+Each description is reduced once to a sparse term-count vector (term ids and
+counts packed as native uint32/uint16 arrays) and cached per folder in
+``<root>/.job-rank.sqlite3``; ``refresh`` recounts only folders whose
+description changed. Ranking concatenates every cached vector and scores all
+postings in a few vectorized NumPy operations. Without NumPy the same maths
+runs in plain Python, which is much slower on large trees.
+"""
+
+import math
+import os
+import re
+import sqlite3
+from array import array
+from collections import Counter
+from pathlib import Path
+
+import layout
+from processor import words
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RANK_NAME = ".job-rank.sqlite3"
+RESUME_TEMPLATE = Path(__file__).parent / "templates" / "resume-template.tex"
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or our that the their this to we will with "
+    "you your us who what which all can may more not any other such they them these those was were been".split()
+)
+_TEX_COMMENT_RE = re.compile(r"(?<!\\)%.*")
+_TEX_URL_RE = re.compile(r"\\(?:href|url)\{[^}]*\}")
+_TEX_ENV_RE = re.compile(r"\\(?:begin|end)\{[^}]*\}(?:\[[^\]]*\])?")
+_TEX_CMD_RE = re.compile(r"\\[A-Za-z]+\*?(?:\[[^\]]*\])?")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS vectors (
+    folder TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    source TEXT,
+    terms BLOB NOT NULL,
+    counts BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def tokens(text):
+    return [w for w in words(text.lower()) if len(w) > 1 and w not in _STOPWORDS and not w.isdigit()]
+
+
+def tex_text(tex):
+    """Plain words of a LaTeX document body: commands, URLs and comments removed."""
+    body = tex.split("\\begin{document}", 1)[-1]
+    for pattern in (_TEX_COMMENT_RE, _TEX_URL_RE, _TEX_ENV_RE, _TEX_CMD_RE):
+        body = pattern.sub(" ", body)
+    return body.replace("{", " ").replace("}", " ")
+
+
+class RankIndex:
+    def __init__(self, root, path=None):
+        self.root = Path(root)
+        self.path = Path(path) if path else self.root / RANK_NAME
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._terms = dict(self._db.execute("SELECT term, id FROM terms"))
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _term_ids(self, counts):
+        ids, tfs = array("I"), array("H")
+        for term, n in counts.items():
+            term_id = self._terms.get(term)
+            if term_id is None:
+                term_id = self._terms[term] = self._db.execute("INSERT INTO terms (term) VALUES (?)", (term,)).lastrowid
+            ids.append(term_id)
+            tfs.append(min(n, 0xFFFF))
+        return ids.tobytes(), tfs.tobytes()
+
+    def refresh(self):
+        """Recount new and changed descriptions and drop deleted ones; returns (added, updated, removed)."""
+        known = {folder: (mtime, size) for folder, mtime, size in self._db.execute("SELECT folder, mtime_ns, size FROM vectors")}
+        added = updated = 0
+        db = self._db
+        db.execute("BEGIN")
+        try:
+            for folder, txt, st in layout.description_files(self.root):
+                rel = os.path.relpath(folder, self.root)
+                old = known.pop(rel, None)
+                if old == (st.st_mtime_ns, st.st_size):
+                    continue
+                try:
+                    with open(txt, encoding="utf-8", errors="replace") as f:
+                        text = f.read()
+                except OSError:
+                    continue
+                source = None
+                if text.startswith("Source:"):
+                    first, _, text = text.partition("\n")
+                    source = first[len("Source:"):].strip()
+                ids, tfs = self._term_ids(Counter(tokens(os.path.basename(folder)) + tokens(text)))
+                db.execute("INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?, ?, ?)",
+                           (rel, st.st_mtime_ns, st.st_size, source, ids, tfs))
+                if old:
+                    updated += 1
+                else:
+                    added += 1
+            db.executemany("DELETE FROM vectors WHERE folder = ?", ((folder,) for folder in known))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            self._terms = dict(db.execute("SELECT term, id FROM terms"))
+            raise
+        return added, updated, len(known)
+
+    def count(self):
+        return self._db.execute("SELECT count(*) FROM vectors").fetchone()[0]
+
+    def rank(self, text, limit=20):
+        """Return [(folder_path, score, source)] for the postings closest to TEXT, best first."""
+        query = {}
+        for term, n in Counter(tokens(text)).items():
+            if (term_id := self._terms.get(term)) is not None:
+                query[term_id] = 1.0 + math.log(n)
+        rows = self._db.execute("SELECT folder, source, terms, counts FROM vectors").fetchall()
+        if not query or not rows:
+            return []
+        vocab = max(self._terms.values()) + 1
+        if np is not None:
+            scores = _score_numpy(rows, query, vocab)
+            best = np.argsort(-scores, kind="stable")[:limit].tolist()
+        else:
+            scores = _score_python(rows, query, vocab)
+            best = sorted(range(len(rows)), key=scores.__getitem__, reverse=True)[:limit]
+        return [(self.root / rows[i][0], float(scores[i]), rows[i][1]) for i in best if scores[i] > 0]
+
+
+def _score_numpy(rows, query, vocab):
+    # CSR-style pass over every posting: document frequencies are one bincount,
+    # per-posting norms and dot products one segmented sum each.
+    n = len(rows)
+    terms = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.uintc)
+    counts = np.frombuffer(b"".join(r[3] for r in rows), dtype=np.ushort)
+    lengths = np.fromiter((len(r[3]) // counts.itemsize for r in rows), dtype=np.intp, count=n)
+    starts = np.cumsum(lengths) - lengths
+    idf = np.log((n + 1) / (np.bincount(terms, minlength=vocab) + 1)) + 1
+    weights = (1 + np.log(counts, dtype=np.float64)) * idf[terms]
+    q = np.zeros(vocab)
+    q[list(query)] = list(query.values())
+    q *= idf
+    # The trailing 0 keeps every start a valid index when the last postings
+    # are empty; reduceat returns an element, not 0, for any empty segment.
+    norms = np.sqrt(np.add.reduceat(np.append(weights * weights, 0), starts))
+    dots = np.add.reduceat(np.append(weights * q[terms], 0), starts)
+    dots[lengths == 0] = 0
+    return dots / (np.maximum(norms, 1e-12) * np.linalg.norm(q))
+
+
+def _score_python(rows, query, vocab):
+    n = len(rows)
+    vectors = []
+    df = [0] * vocab
+    for _, _, ids, tfs in rows:
+        ids, tfs = array("I", ids), array("H", tfs)
+        vectors.append((ids, tfs))
+        for t in ids:
+            df[t] += 1
+    idf = [math.log((n + 1) / (d + 1)) + 1 for d in df]
+    q = {t: w * idf[t] for t, w in query.items()}
+    q_norm = math.sqrt(sum(w * w for w in q.values()))
+    scores = []
+    for ids, tfs in vectors:
+        dot = norm = 0.0
+        for t, c in zip(ids, tfs):
+            w = (1 + math.log(c)) * idf[t]
+            norm += w * w
+            if t in q:
+                dot += w * q[t]
+        scores.append(dot / (max(math.sqrt(norm), 1e-12) * q_norm))
+    return scores
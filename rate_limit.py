@@ -0,0 +1,164 @@
+"""Per-host pacing and retry scheduling shared by every fetch in a session.
+
+Each host family (indeed.com, indeed.ca, linkedin.com, anything else by
+hostname) has a token bucket, so concurrent fetchers together stay under the
+rate a site tolerates. A block (403, 429, 503, 999) pushes the whole host back
+by an exponential backoff with jitter, or by ``Retry-After`` when the site
+sends one; fetchers for other hosts keep going. After ``trip_after`` blocks
+in a row the host's circuit opens and fetches to it fail fast until
+``cooldown`` has passed; the first fetch after that is a trial that closes
+the circuit again if the host answers. A trial that ends without an answer
+(a connection error, a timeout) opens the circuit for another cooldown.
+"""
+
+import random
+import threading
+import time
+import urllib.error
+from email.utils import parsedate_to_datetime
+
+# (requests per second, burst) per host family.
+HOST_RATES = {
+    "indeed.com": (1.0, 2),
+    "indeed.ca": (1.0, 2),
+    "linkedin.com": (0.5, 1),
+}
+DEFAULT_RATE = (5.0, 10)
+RETRY_CODES = (403, 429, 503, 999)
+
+
+class HostPaused(ValueError):
+    """Fetches to HOST are suspended after repeated blocks."""
+
+    def __init__(self, host, seconds):
+        super().__init__(f"{host} paused after repeated blocks; retrying in {seconds:.0f}s. "
+                         "Export fresh cookies or save the page as HTML.")
+        self.host = host
+        self.seconds = seconds
+
+
+def retry_after(value, now=None):
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+class _Host:
+    def __init__(self, rate, burst, now):
+        self.rate, self.burst = rate, burst
+        self.tokens = float(burst)
+        self.stamp = now
+        self.not_before = 0.0  # backoff / Retry-After, for every fetcher of this host
+        self.blocks = 0  # consecutive blocked responses
+        self.open_until = 0.0
+        self.trial = False
+
+
+class RateLimiter:
+    def __init__(self, rates=None, default=DEFAULT_RATE, max_retries=3, base_delay=1.0, max_delay=60.0,
+                 trip_after=4, cooldown=120.0, clock=time.monotonic, sleep=time.sleep):
+        self.rates = HOST_RATES if rates is None else rates
+        self.default = default
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.trip_after = trip_after
+        self.cooldown = cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def family(self, host):
+        host = (host or "").lower().rstrip(".")
+        for name in self.rates:
+            if host == name or host.endswith("." + name):
+                return name
+        return host
+
+    def _state(self, family, now):
+        h = self._hosts.get(family)
+        if h is None:
+            h = self._hosts[family] = _Host(*self.rates.get(family, self.default), now)
+        return h
+
+    def acquire(self, host):
+        """Wait for HOST's turn; raises HostPaused while its circuit is open."""
+        family = self.family(host)
+        with self._lock:
+            now = self._clock()
+            h = self._state(family, now)
+            if h.open_until:
+                if now < h.open_until or h.trial:
+                    raise HostPaused(family, max(h.open_until - now, 0))
+                h.trial = True  # half-open: this fetch decides
+            # Reserve a token now; a negative balance is this caller's place in the queue.
+            h.tokens = min(h.burst, h.tokens + (now - h.stamp) * h.rate) - 1
+            h.stamp = now
+            wait = max(-h.tokens / h.rate, h.not_before - now, 0.0)
+        if wait:
+            self._sleep(wait)
+
+    def success(self, host):
+        with self._lock:
+            h = self._state(self.family(host), self._clock())
+            h.blocks = 0
+            h.open_until = 0.0
+            h.trial = False
+
+    def failed(self, host):
+        """Record a fetch that got no HTTP answer; a half-open trial re-opens the circuit."""
+        with self._lock:
+            now = self._clock()
+            h = self._state(self.family(host), now)
+            if h.trial:
+                h.trial = False
+                h.open_until = max(now + self.cooldown, h.not_before)
+
+    def blocked(self, host, attempt, retry_after_s=None):
+        """Record a block and return the delay before HOST may be tried again."""
+        family = self.family(host)
+        with self._lock:
+            now = self._clock()
+            h = self._state(family, now)
+            h.blocks += 1
+            cap = min(self.max_delay, self.base_delay * 2 ** attempt)
+            delay = cap / 2 + random.uniform(0, cap / 2)
+            if retry_after_s is not None:
+                delay = max(delay, retry_after_s)
+            h.not_before = max(h.not_before, now + delay)
+            if h.trial or h.blocks >= self.trip_after:
+                h.open_until = max(now + self.cooldown, h.not_before)
+                h.trial = False
+            return delay
+
+    def call(self, host, fetch):
+        """Run FETCH() under HOST's pacing, retrying blocked responses with backoff."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(host)
+            try:
+                result = fetch()
+            except urllib.error.HTTPError as e:
+                if e.code in RETRY_CODES:
+                    wait = retry_after(e.headers.get("Retry-After") if e.headers else None)
+                    delay = self.blocked(host, attempt, wait)
+                    if attempt == self.max_retries or delay > self.max_delay:
+                        raise
+                    continue
+                self.success(host)  # an answer that isn't a block (404, 304) still proves the host is open
+                raise
+            except BaseException:
+                # No answer at all proves nothing about the block.
+                self.failed(host)
+                raise
+            self.success(host)
+            return result
+        raise RuntimeError("unreachable")
@@ -0,0 +1,175 @@
+"""Re-run the current parsers over archived pages and refresh changed job folders."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import layout
+import page_archive
+import processor
+import prompt_creator
+import scraper
+from batch import available_cpus
+
+
+def _parse_entry(directory, entry):
+    url, _, body = page_archive.PageArchive(directory).read(entry)
+    return scraper.extract_job(scraper._decode(body), url)
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, ValueError):
+        return None
+
+
+def _stored(folder, known):
+    """(title, company, french, fill) FOLDER was written with; any of them None when not recorded."""
+    if record := processor.read_job_file(folder):
+        return record.get("title"), record.get("company"), bool(record.get("french")), bool(record.get("fill"))
+    e = known().get(folder, {})
+    return e.get("title"), e.get("company"), prompt_creator.prompt_language(_read(folder / "prompt.txt")), None
+
+
+def _source(txt):
+    with open(txt, encoding="utf-8", errors="replace") as f:
+        first = f.readline()
+    if first.startswith("Source:"):
+        return first[len("Source:"):].strip() or None
+    return None
+
+
+def _rename(old, base_dir, job, folder_name, url, manifest):
+    """Move OLD, a (folder, description file name) pair, to where FOLDER_NAME goes now.
+
+    Everything else in the folder (the resume, PDFs) moves with it; the old
+    description file is dropped once the new one has been written.
+    """
+    folder, desc = old
+    rel = manifest.claim(job, folder_name, url) if manifest else folder_name
+    target = base_dir / rel
+    if target.exists():
+        raise FileExistsError(f"Can't rename {folder}: {target} exists")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.rename(folder, target)
+    if manifest:
+        manifest.moved(Path(os.path.relpath(folder, base_dir)).as_posix(), rel)
+    return target / desc
+
+
+def _changed(folder, job, files, stored):
+    # Only what the parsers extract counts: the prompts follow from the
+    # templates and the folder's settings, which a re-parse doesn't change.
+    if not folder.is_dir():
+        return "created"
+    desc_name = next(iter(files))
+    if _read(folder / desc_name) != files[desc_name]:
+        return "updated"
+    for value, old in zip((job.get("title"), job.get("company")), stored[:2]):
+        if old is not None and (value or "").strip() != old:
+            return "updated"
+    return "unchanged"
+
+
+def run_replay(archive, base_dir, french=False, procs=None, dry_run=False, urls=None, manifest=None, fill=False):
+    """Return one result dict per archived URL, using the newest capture of each.
+
+    When several URLs render to the same folder, the most recently captured
+    one wins and the rest are reported as superseded. A posting whose folder
+    name changed (a new title or company) has its old folder, found by URL,
+    renamed rather than left behind. A folder is only
+    written when its description file, or the title or company recorded in
+    .job.json (else manifest.jsonl), differs from the new parse. An existing
+    folder keeps its prompt language and placeholder filling; FRENCH and
+    FILL apply to new folders and to old ones that don't record them.
+    """
+    base_dir = Path(base_dir)
+    entries = [e for e in archive.entries() if urls is None or e["url"] in urls]
+    procs = procs or available_cpus()
+    results, winners = {}, {}
+    with ProcessPoolExecutor(max_workers=procs) as pool:
+        work = iter(enumerate(entries))
+        pending = {}
+        while True:
+            while len(pending) < procs * 4:
+                item = next(work, None)
+                if item is None:
+                    break
+                pending[pool.submit(_parse_entry, str(archive.directory), item[1])] = item
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                i, entry = pending.pop(fut)
+                try:
+                    job = fut.result()
+                    rendered = processor.render_job(job, entry["url"], french)
+                except Exception as e:
+                    results[i] = {"url": entry["url"], "ok": False, "status": "failed", "error": str(e) or type(e).__name__}
+                    continue
+                if manifest:
+                    # A posting the manifest doesn't know yet gets its own new folder.
+                    folder = manifest.find(job, rendered["folder_name"], entry["url"])
+                    slot = folder or ("new", entry["url"])
+                else:
+                    folder = slot = base_dir / rendered["folder_name"]
+                results[i] = {"url": entry["url"], "ok": True, "status": "superseded",
+                              "folder": str(folder or base_dir / rendered["folder_name"]), "captured": entry["date"]}
+                if slot not in winners or winners[slot][0] < i:
+                    winners[slot] = (i, job, rendered["folder_name"], rendered["files"], folder)
+
+    by_folder = None
+
+    def known():
+        nonlocal by_folder
+        if by_folder is None:
+            by_folder = {base_dir / e["folder"]: e for e in manifest.entries()} if manifest else {}
+        return by_folder
+
+    by_url = None
+
+    def previous(url):
+        # The (folder, description file name) this posting has under its old name.
+        nonlocal by_url
+        if manifest:
+            e = manifest.lookup(url)
+            return (base_dir / e["folder"], e["file"]) if e else None
+        if by_url is None:
+            by_url = {}
+            for folder, txt, _ in layout.walk_description_files(base_dir):
+                if source := _source(txt):
+                    by_url.setdefault(layout.posting_key(None, source), (Path(folder), os.path.basename(txt)))
+        return by_url.get(layout.posting_key(None, url))
+
+    targets = {w[4] for w in winners.values() if w[4]}
+    for i, job, folder_name, files, folder in winners.values():
+        url = entries[i]["url"]
+        old = None
+        if not (folder and folder.is_dir()):
+            old = previous(url)
+            # Not a folder another posting is being written to in this run.
+            if old and (old[0] in targets or not old[0].is_dir()):
+                old = None
+        here = folder if folder and folder.is_dir() else old[0] if old else None
+        stored = _stored(here, known) if here else (None, None, None, None)
+        if old:
+            status = "renamed"
+            results[i]["previous"] = str(old[0])
+        else:
+            status = _changed(folder, job, files, stored) if folder else "created"
+        if status != "unchanged" and not dry_run:
+            try:
+                stale = _rename(old, base_dir, job, folder_name, url, manifest) if old else None
+            except OSError as e:
+                results[i].update(ok=False, status="failed", error=str(e))
+                continue
+            lang = french if stored[2] is None else stored[2]
+            out = processor.process_job(job, base_dir, url, french=lang, manifest=manifest,
+                                        fill=fill if stored[3] is None else stored[3])
+            results[i]["folder"] = str(out["folder_path"])
+            if stale and stale.name != next(iter(files)):
+                stale.unlink(missing_ok=True)
+        results[i]["status"] = status
+    return [results[i] for i in sorted(results)]
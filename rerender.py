@@ -0,0 +1,146 @@
+"""Regenerate the prompts in existing job folders after a template edit.
+
+Each folder's description file is the source: its text is wrapped and run
+through the current prompt templates again, exactly as ``process_job``
+would. A prompt is only written when its content differs from the file on
+disk, and then through a temporary file and ``os.replace``. Unchanged files
+keep their mtime, so nothing downstream sees them as new. Folders are split
+into chunks and rendered in worker processes.
+
+Title, company, language and whether the prompts had ``[TITLE]`` and
+``[COMPANY]`` filled in come from the folder's ``.job.json``, written by
+``process_job``. A folder made before that file existed takes title and
+company from ``manifest.jsonl`` when it has them. It counts as filled when
+its old ``prompt-cover.txt`` has a company where the cover template puts
+``[COMPANY]``, and that is also where its company is read back from. Its
+language is known only when the old prompt opens with the first words of
+exactly one language's template; otherwise the folder fails until ``-vf``
+or ``--english`` says which. Once resolved, the folder gets its
+``.job.json``.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import file_ops
+import layout
+import processor
+import prompt_creator
+
+CHUNK = 256
+PROMPTS = ("prompt.txt", "prompt-cover.txt")
+
+
+def read_description(text):
+    """(source URL or None, description) from a description file."""
+    if text.startswith("Source:"):
+        first, _, text = text.partition("\n")
+        return first[len("Source:"):].strip() or None, text.strip("\n")
+    return None, text
+
+
+def _read(path):
+    try:
+        return path.read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        return None
+
+
+def _company_pattern(french):
+    # A few words on each side of [COMPANY] in the cover template, so an edit
+    # elsewhere in the template still lets the old value be found.
+    for raw in prompt_creator.load("cover-letter-template.txt", french).text.splitlines():
+        before, found, after = raw.partition("[COMPANY]")
+        if not found:
+            continue
+        lead, trail = before.split()[-3:], after.split()[:2]
+        if not lead and not trail:
+            return None
+        return re.compile(r"\s+".join(map(re.escape, lead)) + (r"\s+" if before[-1:].isspace() else "")
+                          + r"(.{1,200}?)"
+                          + (r"\s+" if after[:1].isspace() else "") + r"\s+".join(map(re.escape, trail)), re.S)
+    return None
+
+
+class _Templates:
+    """What one worker needs to know about the current templates, worked out once per chunk."""
+
+    def __init__(self):
+        self.company = {fr: _company_pattern(fr) for fr in (False, True)}
+        self.needs = {
+            fr: {name for tpl in ("prompt-template.txt", "cover-letter-template.txt")
+                 for name in prompt_creator._PLACEHOLDER_RE.findall(prompt_creator.load(tpl, fr).text)}
+            for fr in (False, True)
+        }
+
+    def recover_company(self, old_cover, french):
+        pattern = self.company[french]
+        m = pattern.search(old_cover) if pattern and old_cover else None
+        return " ".join(m.group(1).split()) if m else None
+
+
+def _rerender_one(tpls, folder, txt, title, company, french, fill, dry_run):
+    folder = Path(folder)
+    try:
+        source, desc = read_description(Path(txt).read_text(encoding="utf-8"))
+        old = {name: _read(folder / name) for name in PROMPTS}
+        old[processor.JOB_FILE] = _read(folder / processor.JOB_FILE)
+        if record := processor.read_job_file(folder):
+            title, company = record.get("title"), record.get("company")
+            french = bool(record.get("french")) if french is None else french
+            filled = bool(record.get("fill"))
+        else:
+            if french is None:
+                french = prompt_creator.prompt_language(old["prompt.txt"])
+            if french is None:
+                raise ValueError("prompt language unknown (prompt.txt matches neither template); "
+                                 "rerun with -vf or --english")
+            recovered = tpls.recover_company(old["prompt-cover.txt"], french)
+            filled = recovered not in (None, "[COMPANY]")
+            company = company or (recovered if filled else None)
+        fill = filled if fill is None else fill
+        missing = [k.lower() for k, v in (("TITLE", title), ("COMPANY", company))
+                   if fill and k in tpls.needs[french] and not v]
+        if missing:
+            raise ValueError(f"{' and '.join(missing)} unknown; not in {processor.JOB_FILE}, "
+                             "manifest.jsonl or the old prompts")
+        wrapped = file_ops.wrap(desc.strip() or "Description not found.")
+        files = processor.render_prompts(wrapped, french, {"title": title, "company": company} if fill else None)
+        files[processor.JOB_FILE] = processor.job_file_text(title, company, french, fill)
+        changed = [name for name, text in files.items() if old[name] != text]
+        if not dry_run:
+            for name in changed:
+                file_ops.replace_text(folder / name, files[name])
+        return {"folder": str(folder), "status": "updated" if changed else "current", "files": changed}
+    except Exception as e:
+        return {"folder": str(folder), "status": "failed", "error": str(e) or type(e).__name__}
+
+
+def _rerender_chunk(items, french, fill, dry_run):
+    tpls = _Templates()
+    return [_rerender_one(tpls, *item, french, fill, dry_run) for item in items]
+
+
+def rerender(base_dir, workers=None, french=None, dry_run=False, chunk=CHUNK, fill=None):
+    """Re-render the prompts of every job folder under BASE_DIR; returns one result per folder.
+
+    FRENCH forces the French (True) or English (False) templates, and FILL
+    turns placeholder filling on or off; by default each folder keeps what
+    its .job.json records.
+    """
+    base_dir = Path(base_dir)
+    known = {}
+    if layout.Manifest.exists(base_dir):
+        for e in layout.Manifest(base_dir).entries():
+            known[os.path.join(base_dir, *e["folder"].split("/"))] = (e.get("title"), e.get("company"))
+    items = [(folder, txt, *known.get(folder, (None, None))) for folder, txt, _ in layout.description_files(base_dir)]
+    chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        return [r for c in chunks for r in _rerender_chunk(c, french, fill, dry_run)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [r for rs in pool.map(_rerender_chunk, chunks, [french] * len(chunks), [fill] * len(chunks),
+                                     [dry_run] * len(chunks))
+                for r in rs]
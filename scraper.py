@@ -1,49 +1,47 @@
 """Job posting scraper with support for Indeed, LinkedIn, and local HTML files."""
 
-import gzip
+import codecs
 import http.cookiejar
 import json
-import platform
 import re
+import sys
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import zlib
+from contextlib import ExitStack
 from html.parser import HTMLParser
 from pathlib import Path
 
+import http_session
+import rate_limit
+import timings
+
 COOKIES_FILE = Path(__file__).parent / "cookies.txt"
+MAX_BODY_BYTES = 32 * 1024 * 1024
 
 _CHROME_VER = "131"
 _UA_WIN = f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{_CHROME_VER}.0.0.0 Safari/537.36"
 _UA_LINUX = f"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{_CHROME_VER}.0.0.0 Safari/537.36"
 
+_LI_DESC_RE = re.compile(r'show-more-less-html__markup[^>]*>(.*?)</div>', re.DOTALL | re.I)
+_LI_ORG_RE = re.compile(r'topcard__org-name-link[^>]*>([^<]+)</a>', re.I)
+_BLOCK_RE = re.compile(r"captcha|verify you are a human", re.I)
+_AUTH_WALL_RE = re.compile(r'sign in to view|join now to see|authwall|"isloggedin":false', re.I)
+# A comment is matched as a whole (group 2 is None) so a <script> inside it is skipped, as the parser does.
+_SCRIPT_RE = re.compile(r"<!--.*?(?:-->|\Z)|<script\b([^>]*)>(.*?)</script\s*>", re.I | re.S)
+_TYPE_ATTR_RE = re.compile(r"""\stype\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_SIGNAL_TAIL = 32
+_CHUNK = 64 * 1024
 
-class _ScriptCollector(HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self.scripts = []
-        self._depth = 0
-        self._type = None
-        self._buf = []
 
-    def handle_starttag(self, tag, attrs):
-        if tag == "script":
-            self._depth = 1
-            self._type = dict(attrs).get("type")
-            self._buf = []
-        elif self._depth:
-            self._depth += 1
+class _Done(Exception):
+    """Raised by an extractor once the page has yielded everything it needs."""
 
-    def handle_data(self, data):
-        if self._depth:
-            self._buf.append(data)
 
-    def handle_endtag(self, tag):
-        if tag == "script" and self._depth:
-            self.scripts.append((self._type, "".join(self._buf).strip()))
-            self._depth = 0
+class Blocked(ValueError):
+    """The site answered with a CAPTCHA or a login wall instead of the posting."""
 
 
 class _TextExtractor(HTMLParser):
@@ -66,28 +64,67 @@ class _TextExtractor(HTMLParser):
         return "\n".join(ln.strip() for ln in "".join(self._parts).splitlines() if ln.strip())
 
 
-class _MetaExtractor(HTMLParser):
+class _ScriptCollector:
+    def __init__(self):
+        self.job = None
+        self._depth = 0
+        self._type = None
+        self._skip = False
+        self._buf = []
+
+    def start(self, tag, a):
+        if tag == "script":
+            self._depth = 1
+            self._type = a.get("type")
+            # Typed non-JSON-LD scripts are never parsed, so don't buffer them.
+            self._skip = bool(self._type) and self._type.lower() != "application/ld+json"
+            self._buf = []
+        elif self._depth:
+            self._depth += 1
+
+    def data(self, data):
+        if self._depth and not self._skip:
+            self._buf.append(data)
+
+    def end(self, tag):
+        if tag == "script" and self._depth:
+            self._depth = 0
+            if self._skip:
+                return
+            try:
+                payload = json.loads("".join(self._buf).strip())
+            except json.JSONDecodeError:
+                return
+            # The first JobPosting wins, so nothing after it can change the result.
+            if job := _find_job_posting(payload):
+                self.job = job
+                raise _Done
+
+
+class _MetaExtractor:
     def __init__(self):
-        super().__init__()
         self.meta = {}
 
-    def handle_starttag(self, tag, attrs):
+    def start(self, tag, a):
         if tag == "meta":
-            d = dict(attrs)
-            key = d.get("property") or d.get("name")
-            if key and d.get("content"):
-                self.meta[key] = d["content"]
+            key = a.get("property") or a.get("name")
+            if key and a.get("content"):
+                self.meta[key] = a["content"]
+
+    def data(self, data):
+        pass
+
+    def end(self, tag):
+        pass
 
 
-class _IndeedExtractor(HTMLParser):
+class _IndeedExtractor:
     def __init__(self):
-        super().__init__()
         self.title = self.company = self.description = ""
         self._title_d = self._company_d = self._desc_d = 0
         self._t_buf, self._c_buf, self._d_buf = [], [], []
 
-    def handle_starttag(self, tag, attrs):
-        a = dict(attrs)
+    def start(self, tag, a):
         if self._title_d:
             self._title_d += 1
         if self._company_d:
@@ -108,7 +145,7 @@ class _IndeedExtractor(HTMLParser):
         if cn and any(c.isalpha() for c in cn):
             self._c_buf.append(cn)
 
-    def handle_endtag(self, tag):
+    def end(self, tag):
         if self._desc_d and tag in ("p", "li", "ul", "ol"):
             self._d_buf.append("\n")
         if self._title_d:
@@ -118,7 +155,7 @@ class _IndeedExtractor(HTMLParser):
         if self._desc_d:
             self._desc_d -= 1
 
-    def handle_data(self, data):
+    def data(self, data):
         if self._title_d:
             self._t_buf.append(data)
         if self._company_d:
@@ -151,6 +188,41 @@ class _IndeedExtractor(HTMLParser):
         return "jobDescriptionText" in (a.get("class") or "")
 
 
+class _PageParser(HTMLParser):
+    """Single tokenizer pass feeding every enabled extractor."""
+
+    def __init__(self, scripts=True, meta=True, indeed=True):
+        super().__init__()
+        self.scripts = _ScriptCollector() if scripts else None
+        self.meta = _MetaExtractor() if meta else None
+        self.indeed = _IndeedExtractor() if indeed else None
+        self._sinks = [s for s in (self.scripts, self.meta, self.indeed) if s]
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        for s in self._sinks:
+            s.start(tag, a)
+
+    def handle_endtag(self, tag):
+        for s in self._sinks:
+            s.end(tag)
+
+    def handle_data(self, data):
+        for s in self._sinks:
+            s.data(data)
+
+
+def _scan(html, scripts=True, meta=True, indeed=True):
+    page = _PageParser(scripts, meta, indeed)
+    try:
+        page.feed(html)
+    except _Done:
+        pass
+    if page.indeed:
+        page.indeed.finalize()
+    return page
+
+
 def _strip_html(html):
     ext = _TextExtractor()
     ext.feed(html or "")
@@ -169,7 +241,7 @@ def _load_cookies():
 
 
 def _headers():
-    is_win = platform.system().lower().startswith("win")
+    is_win = sys.platform.startswith("win")
     ua = _UA_WIN if is_win else _UA_LINUX
     plat = '"Windows"' if is_win else '"Linux"'
     return {
@@ -184,39 +256,194 @@ def _headers():
     }
 
 
-def _decompress(data, encoding):
-    if encoding == "gzip":
-        return gzip.decompress(data)
-    if encoding == "deflate":
-        try:
-            return zlib.decompress(data)
-        except zlib.error:
-            return zlib.decompress(data, -zlib.MAX_WBITS)
-    if encoding == "br":
+class _TooLarge(ValueError):
+    pass
+
+
+class _Inflater:
+    """Incremental gzip/deflate/brotli decoder with a cap on decompressed size."""
+
+    def __init__(self, encoding, limit=MAX_BODY_BYTES):
+        self.limit = limit
+        self.size = 0
+        self._encoding = encoding
+        self._raw = False
+        self._started = False
+        self._obj = self._new()
+
+    def _new(self):
+        if self._encoding == "gzip":
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._encoding == "deflate":
+            return zlib.decompressobj(-zlib.MAX_WBITS if self._raw else zlib.MAX_WBITS)
+        if self._encoding == "br":
+            try:
+                import brotli
+                return brotli.Decompressor()
+            except ImportError:
+                pass
+        return None
+
+    def _inflate(self, chunk, out):
+        if self._encoding == "br":
+            out.append(self._obj.process(chunk))
+            return
+        budget = self.limit - self.size
+        while chunk:
+            out.append(self._obj.decompress(chunk, _CHUNK))
+            # Checked per _CHUNK of output, so a bomb stops near the cap.
+            budget -= len(out[-1])
+            if budget < 0:
+                raise _TooLarge(f"Page exceeds {self.limit} bytes after decompression.")
+            chunk = self._obj.unconsumed_tail
+            if self._obj.eof and self._obj.unused_data and self._encoding == "gzip":
+                chunk = self._obj.unused_data
+                self._obj = self._new()
+
+    def _recover(self, chunk, out):
+        if self._started or any(out):
+            # Corrupt or truncated tail: keep what decoded cleanly.
+            self._obj = False
+            return out
+        if self._encoding == "deflate" and not self._raw:
+            self._raw = True
+            self._obj = self._new()
+            try:
+                out = []
+                self._inflate(chunk, out)
+                return out
+            except _TooLarge:
+                raise
+            except Exception:
+                pass
+        self._obj = None
+        return [chunk]
+
+    def _check(self, pieces):
+        for p in pieces:
+            self.size += len(p)
+        if self.size > self.limit:
+            raise _TooLarge(f"Page exceeds {self.limit} bytes after decompression.")
+        self._started = self._started or self.size > 0
+        return pieces
+
+    def feed(self, chunk):
+        if self._obj is None:
+            return self._check([chunk])
+        if self._obj is False:
+            return []
+        out = []
         try:
-            import brotli
-            return brotli.decompress(data)
-        except ImportError:
-            pass
-    return data
+            self._inflate(chunk, out)
+        except _TooLarge:
+            raise
+        except Exception:
+            out = self._recover(chunk, out)
+        return self._check(out)
+
+    def flush(self):
+        if self._obj and self._encoding != "br":
+            return self._check([self._obj.flush()])
+        return []
+
+
+def _decompress(data, encoding, limit=MAX_BODY_BYTES):
+    with timings.span("decompress", encoding=encoding) as sp:
+        inflater = _Inflater(encoding, limit)
+        out = b"".join(inflater.feed(data) + inflater.flush())
+        sp.set(bytes=len(out))
+        return out
 
 
-def _http_get(url, jar=None):
-    handlers = [urllib.request.HTTPCookieProcessor(jar or http.cookiejar.CookieJar())]
-    opener = urllib.request.build_opener(*handlers)
-    hdrs = _headers()
+def new_session(save_cookies=False, archive=None):
+    jar = _load_cookies()
+    if jar is None and save_cookies:
+        jar = http.cookiejar.MozillaCookieJar(str(COOKIES_FILE))
+    session = http_session.Session(_headers(), jar, save_cookies=save_cookies)
+    session.archive = archive
+    session.limiter = rate_limit.RateLimiter()
+    return session
+
+
+def _request_headers(url, extra_headers=None):
     parsed = urllib.parse.urlparse(url)
-    hdrs["Referer"] = f"{parsed.scheme}://{parsed.netloc}/"
+    return {"Referer": f"{parsed.scheme}://{parsed.netloc}/", **(extra_headers or {})}
 
-    req = urllib.request.Request(url, headers=hdrs)
-    with opener.open(req, timeout=30) as resp:
-        data = resp.read()
-        enc = resp.headers.get("Content-Encoding", "").lower()
-        try:
-            data = _decompress(data, enc)
-        except Exception:
-            pass
-        return data.decode("utf-8", errors="replace")
+
+def _http_get(session, url, extra_headers=None):
+    data, headers = session.get(url, _request_headers(url, extra_headers))
+    data = _decompress(data, headers.get("Content-Encoding", "").lower())
+    if session.archive:
+        session.archive.append(url, headers, data)
+    return data, headers
+
+
+def _iter_body(resp):
+    inflater = _Inflater(resp.headers.get("Content-Encoding", "").lower())
+    # Network and decompression time interleave chunk by chunk, so they are
+    # summed here and reported as one span each.
+    read_s = inflate_s = 0.0
+    wire = 0
+    try:
+        while True:
+            t0 = time.perf_counter()
+            chunk = resp.read(_CHUNK)
+            t1 = time.perf_counter()
+            read_s += t1 - t0
+            if not chunk:
+                break
+            wire += len(chunk)
+            pieces = inflater.feed(chunk)
+            inflate_s += time.perf_counter() - t1
+            yield from pieces
+        yield from inflater.flush()
+    finally:
+        timings.add("http_read", read_s, bytes=wire)
+        timings.add("decompress", inflate_s, bytes=inflater.size)
+
+
+def _iter_file(path):
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            yield chunk
+
+
+class _Tee:
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def write(self, data):
+        for s in self.sinks:
+            s.write(data)
+
+
+def _consume(chunks, ex, sink=None):
+    # Decode and parse until the extractor is satisfied; a cache or archive
+    # sink still receives the rest of the body so the stored copy is complete.
+    dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for data in chunks:
+        if sink:
+            sink.write(data)
+        if not ex.done:
+            ex.feed(dec.decode(data))
+        elif sink is None:
+            break
+    if not ex.done:
+        ex.feed(dec.decode(b"", final=True))
+
+
+def _stream_http(session, url, extra_headers, ex, cache=None):
+    with session.open(url, _request_headers(url, extra_headers)) as resp, ExitStack() as stack:
+        sinks = []
+        if cache:
+            sinks.append(stack.enter_context(cache.writer(url, resp.headers)))
+        if session.archive:
+            sinks.append(stack.enter_context(session.archive.writer(url, resp.headers, resp.status)))
+        _consume(_iter_body(resp), ex, sinks[0] if len(sinks) == 1 else _Tee(sinks) if sinks else None)
+
+
+def _decode(data):
+    return data.decode("utf-8", errors="replace")
 
 
 def _local_path(value):
@@ -231,56 +458,123 @@ def _local_path(value):
     return p if p.exists() else None
 
 
-def fetch_html(url):
-    lp = _local_path(url)
-    if lp:
-        return lp.read_text(encoding="utf-8", errors="replace")
+def _with_retries(url, fetch, session=None):
+    if session is None:
+        with new_session() as session:
+            return _with_retries(url, fetch, session)
 
-    jar = _load_cookies()
     is_linkedin = "linkedin.com" in url.lower()
     is_indeed = "indeed.com" in url.lower() or "indeed.ca" in url.lower()
 
-    for attempt in range(2):
-        try:
-            if attempt:
-                time.sleep(1)
-            return _http_get(url, jar)
-        except urllib.error.HTTPError as e:
-            if e.code not in (403, 429, 999):
-                raise
-            if attempt == 1:
-                if e.code == 999 and is_linkedin:
-                    raise ValueError("LinkedIn blocked (999). Export cookies or save page as HTML.") from e
-                if e.code == 403 and is_indeed:
-                    raise ValueError("Indeed blocked (403). Refresh cookies or save page as HTML.") from e
-                raise
-    raise RuntimeError("Failed to fetch HTML")
+    # The session's limiter is shared by every fetcher: per-host token
+    # buckets, backoff with jitter or Retry-After, and a circuit breaker.
+    try:
+        if session.limiter is None:
+            return fetch(session)
+        return session.limiter.call(urllib.parse.urlsplit(url).hostname, lambda: fetch(session))
+    except urllib.error.HTTPError as e:
+        if e.code == 999 and is_linkedin:
+            raise ValueError("LinkedIn blocked (999). Export cookies or save page as HTML.") from e
+        if e.code == 403 and is_indeed:
+            raise ValueError("Indeed blocked (403). Refresh cookies or save page as HTML.") from e
+        raise
 
 
-def _extract_json_ld(html):
-    col = _ScriptCollector()
-    col.feed(html)
-    for typ, content in col.scripts:
-        if typ and typ.lower() != "application/ld+json":
-            continue
-        try:
-            yield json.loads(content)
-        except json.JSONDecodeError:
-            pass
+def _fetch_remote(url, extra_headers=None, session=None):
+    return _with_retries(url, lambda s: _http_get(s, url, extra_headers), session)
+
+
+def _fetch_cached(url, cache, session):
+    entry = cache.get(url)
+    if entry and (cache.offline or cache.is_fresh(entry[0])):
+        return _decode(entry[1])
+    if cache.offline:
+        raise ValueError(f"Not in cache (offline mode): {url}")
+
+    try:
+        data, headers = _fetch_remote(url, cache.validators(entry[0]) if entry else None, session)
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not entry:
+            raise
+        cache.refresh(url, entry[0], e.headers)
+        return _decode(entry[1])
+    cache.put(url, data, headers)
+    return _decode(data)
+
+
+def _stream_cached(url, cache, session, ex):
+    entry = cache.lookup(url)
+    if entry and (cache.offline or cache.is_fresh(entry[0])):
+        return _consume(_iter_file(entry[1]), ex)
+    if cache.offline:
+        raise ValueError(f"Not in cache (offline mode): {url}")
+
+    extra = cache.validators(entry[0]) if entry else None
+    try:
+        _with_retries(url, lambda s: _stream_http(s, url, extra, ex, cache), session)
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not entry:
+            raise
+        cache.refresh(url, entry[0], e.headers)
+        _consume(_iter_file(entry[1]), ex)
+
+
+def fetch_html(url, cache=None, session=None, index=None):
+    with timings.span("fetch_html", url=url) as sp:
+        lp = _local_path(url)
+        if index and not lp:
+            index.check_url(url)
+        if lp:
+            html = lp.read_text(encoding="utf-8", errors="replace")
+        elif cache:
+            html = _fetch_cached(url, cache, session)
+        else:
+            html = _decode(_fetch_remote(url, session=session)[0])
+        sp.set(bytes=len(html))
+        return html
+
+
+def _posting(title, company, description):
+    # job_posting is only needed once a page has parsed.
+    from job_posting import JobPosting
+
+    return JobPosting(title, company, description)
 
 
 def _find_job_posting(data):
-    if isinstance(data, dict):
-        jt = data.get("@type")
-        if jt == "JobPosting" or (isinstance(jt, list) and "JobPosting" in jt):
-            return data
-        for v in data.values():
-            if found := _find_job_posting(v):
-                return found
-    elif isinstance(data, list):
-        for item in data:
-            if found := _find_job_posting(item):
-                return found
+    # Iterative pre-order walk, so @graph arrays and deep nesting can't hit
+    # the recursion limit and the first match returns immediately.
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            jt = node.get("@type")
+            if jt == "JobPosting" or (isinstance(jt, list) and "JobPosting" in jt):
+                return node
+            stack.extend(reversed(node.values()))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def _fast_json_ld(html):
+    # Locate script blocks by regex and decode only JSON-LD (or untyped, as
+    # the parser does) blocks that mention a JobPosting, skipping
+    # tokenization of the rest of the page.
+    for m in _SCRIPT_RE.finditer(html):
+        block = m.group(2)
+        if block is None or "JobPosting" not in block:
+            continue
+        if t := _TYPE_ATTR_RE.search(m.group(1)):
+            typ = next(g for g in t.groups() if g is not None)
+            if typ and typ.lower() != "application/ld+json":
+                continue
+        try:
+            payload = json.loads(block)
+        except json.JSONDecodeError:
+            continue
+        if job := _find_job_posting(payload):
+            return job
     return None
 
 
@@ -296,20 +590,14 @@ def _normalize_ld(job):
                 company = o["name"]
                 break
     desc = _strip_html(job.get("description", ""))
-    return {"title": title.strip(), "company": company.strip(), "description": desc.strip()}
+    return _posting(title.strip(), company.strip(), desc.strip())
 
 
-def parse_json_ld(html):
-    for payload in _extract_json_ld(html):
-        if job := _find_job_posting(payload):
-            return _normalize_ld(job)
-    return None
-
+def _job_from_scripts(scripts):
+    return _normalize_ld(scripts.job) if scripts.job else None
 
-def parse_linkedin(html):
-    meta = _MetaExtractor()
-    meta.feed(html)
 
+def _linkedin_from(html, meta):
     og = meta.meta.get("og:title", "")
     title = company = ""
 
@@ -319,60 +607,165 @@ def parse_linkedin(html):
         title = re.sub(r"\s*\|\s*LinkedIn\s*$", "", og).strip()
 
     desc = ""
-    if m := re.search(r'show-more-less-html__markup[^>]*>(.*?)</div>', html, re.DOTALL | re.I):
+    if m := _LI_DESC_RE.search(html):
         desc = _strip_html(m.group(1))
     desc = desc or meta.meta.get("og:description", "") or meta.meta.get("description", "")
 
     if not company:
-        if m := re.search(r'topcard__org-name-link[^>]*>([^<]+)</a>', html, re.I):
+        if m := _LI_ORG_RE.search(html):
             company = " ".join(m.group(1).split())
 
     if title or company or desc:
-        return {"title": title.strip(), "company": company.strip(), "description": desc.strip()}
+        return _posting(title.strip(), company.strip(), desc.strip())
     return None
 
 
-def parse_indeed(html):
-    ext = _IndeedExtractor()
-    ext.feed(html)
-    ext.finalize()
-
-    if not ext.title or not ext.company:
-        meta = _MetaExtractor()
-        meta.feed(html)
-        ext.title = ext.title or " ".join((meta.meta.get("og:title") or "").split())
-
-    if not ext.description:
-        meta = _MetaExtractor()
-        meta.feed(html)
-        ext.description = "\n".join(ln.strip() for ln in (meta.meta.get("og:description") or "").splitlines() if ln.strip())
-
-    if ext.title or ext.company or ext.description:
-        return {"title": ext.title, "company": ext.company, "description": ext.description}
+def _indeed_from(ext, meta):
+    title, company, description = ext.title, ext.company, ext.description
+
+    if not title or not company:
+        title = title or " ".join((meta.meta.get("og:title") or "").split())
+
+    if not description:
+        description = "\n".join(ln.strip() for ln in (meta.meta.get("og:description") or "").splitlines() if ln.strip())
+
+    if title or company or description:
+        return _posting(title, company, description)
     return None
 
 
-def _is_auth_wall(html):
-    lower = html.lower()
-    return any(s in lower for s in ("sign in to view", "join now to see", "authwall", '"isloggedin":false'))
+@timings.timed("parse_json_ld")
+def parse_json_ld(html):
+    if job := _fast_json_ld(html):
+        return _normalize_ld(job)
+    return _job_from_scripts(_scan(html, meta=False, indeed=False).scripts)
 
 
-def scrape_job(url):
-    is_linkedin = "linkedin.com" in url.lower()
-    html = fetch_html(url)
-
-    job = parse_json_ld(html)
-    if not job and is_linkedin:
-        job = parse_linkedin(html)
-    if not job:
-        job = parse_indeed(html)
-
-    if not job:
-        lower = html.lower()
-        if "captcha" in lower or "verify you are a human" in lower:
-            raise ValueError("Blocked by CAPTCHA. Save page as HTML and pass file path.")
-        if is_linkedin and _is_auth_wall(html):
-            raise ValueError("LinkedIn auth wall. Export cookies or save page as HTML.")
-        raise ValueError("No job data found. Try saving page as HTML.")
+@timings.timed("parse_linkedin")
+def parse_linkedin(html):
+    return _linkedin_from(html, _scan(html, scripts=False, indeed=False).meta)
 
+
+@timings.timed("parse_indeed")
+def parse_indeed(html):
+    page = _scan(html, scripts=False)
+    return _indeed_from(page.indeed, page.meta)
+
+
+def _is_auth_wall(html):
+    return bool(_AUTH_WALL_RE.search(html))
+
+
+class _Extraction:
+    """One page's worth of extraction state, fed whole or chunk by chunk."""
+
+    def __init__(self, url="", streaming=False):
+        self.is_linkedin = "linkedin.com" in url.lower()
+        self.streaming = streaming
+        self.done = False
+        # LinkedIn pages almost always resolve via JSON-LD or meta tags, so the
+        # Indeed extractor only gets a second pass there if both come up empty.
+        # Only a JSON-LD posting ends the stream early: one later in the page
+        # still beats the Indeed markup, as it does in extract_job.
+        self.page = _PageParser(indeed=not self.is_linkedin)
+        # The LinkedIn fallback regexes need the raw markup.
+        self._raw = [] if streaming and self.is_linkedin else None
+        self._tail = ""
+        self._blocked = self._walled = False
+        self._parse_s = 0.0
+        self._chars = 0
+
+    def feed(self, text):
+        if self.done:
+            return True
+        t0 = time.perf_counter()
+        self._chars += len(text)
+        if self.streaming:
+            probe = self._tail + text
+            self._blocked = self._blocked or bool(_BLOCK_RE.search(probe))
+            self._walled = self._walled or bool(_AUTH_WALL_RE.search(probe))
+            self._tail = probe[-_SIGNAL_TAIL:]
+            if self._raw is not None:
+                self._raw.append(text)
+        try:
+            self.page.feed(text)
+        except _Done:
+            self.done = True
+        self._parse_s += time.perf_counter() - t0
+        return self.done
+
+    def result(self, html=None):
+        if self.streaming:
+            timings.add("parse", self._parse_s, bytes=self._chars, early_exit=self.done)
+        if html is None and self._raw is not None:
+            html = "".join(self._raw)
+        page = self.page
+        if page.indeed:
+            page.indeed.finalize()
+
+        job = _job_from_scripts(page.scripts)
+        if not job and self.is_linkedin:
+            job = _linkedin_from(html, page.meta)
+        if not job:
+            if page.indeed is None:
+                page.indeed = _scan(html, scripts=False, meta=False).indeed
+            job = _indeed_from(page.indeed, page.meta)
+
+        if not job:
+            blocked = _BLOCK_RE.search(html) if html is not None else self._blocked
+            walled = _is_auth_wall(html) if html is not None else self._walled
+            if blocked:
+                raise Blocked("Blocked by CAPTCHA. Save page as HTML and pass file path.")
+            if self.is_linkedin and walled:
+                raise Blocked("LinkedIn auth wall. Export cookies or save page as HTML.")
+            raise ValueError("No job data found. Try saving page as HTML.")
+
+        return job
+
+
+def _with_source(job, url):
+    # Only a web address is a source URL; a local path passed in its place is not.
+    if url and url.lower().startswith(("http://", "https://")):
+        job.url = url
     return job
+
+
+def extract_job(html, url=""):
+    with timings.span("extract_job", bytes=len(html)) as sp:
+        if job := _fast_json_ld(html):
+            sp.set(fast_path=True)
+            return _with_source(_normalize_ld(job), url)
+        ex = _Extraction(url)
+        ex.feed(html)
+        return _with_source(ex.result(html), url)
+
+
+def _iter_text_file(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while text := f.read(_CHUNK):
+            yield text
+
+
+@timings.timed("scrape_job")
+def scrape_job(url, cache=None, session=None, index=None):
+    # Stream the page through the parser, stopping as soon as the posting is captured.
+    ex = _Extraction(url, streaming=True)
+    lp = _local_path(url)
+    if index and not lp:
+        # Raises job_index.Duplicate before any request goes out.
+        index.check_url(url)
+    if lp:
+        for text in _iter_text_file(lp):
+            if ex.feed(text):
+                break
+    elif cache:
+        _stream_cached(url, cache, session, ex)
+    else:
+        _with_retries(url, lambda s: _stream_http(s, url, None, ex), session)
+    try:
+        return _with_source(ex.result(), url)
+    except Blocked:
+        if cache and not lp:
+            # A challenge page came back as a 2xx; don't serve it again from the cache.
+            cache.discard(url)
+        raise
@@ -0,0 +1,160 @@
+"""Full-text search over job folder descriptions.
+
+Each job folder's description (listed by the manifest when there is one,
+else ``<folder>/<folder>.txt`` found by a shallow walk) is tokenized with
+``processor.words`` and stored in an SQLite FTS5 table (an inverted index
+with positions), so phrase, boolean and prefix queries are answered from
+the index and ranked with BM25. ``refresh`` reindexes only folders whose
+description changed.
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+import layout
+from processor import words
+
+INDEX_NAME = ".job-search.sqlite3"
+
+_QUERY_RE = re.compile(r'"[^"]*"?|[()]|[^\s()"]+')
+_OPERATORS = {"AND", "OR", "NOT"}
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    folder TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    source TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings USING fts5(name, body, tokenize = "unicode61 remove_diacritics 0");
+"""
+
+
+def _document(name, text):
+    source = None
+    if text.startswith("Source:"):
+        first, _, text = text.partition("\n")
+        source = first[len("Source:"):].strip()
+    return source, " ".join(words(name)), " ".join(words(text))
+
+
+def _term(word, prefix=False):
+    tokens = words(word)
+    if not tokens:
+        return None
+    return '"' + " ".join(tokens) + '"' + ("*" if prefix else "")
+
+
+def to_match(query):
+    """Translate a user query into an FTS5 MATCH expression.
+
+    Words are ANDed; ``OR``, ``NOT``, parentheses, ``"exact phrases"``,
+    ``-word`` and ``prefix*`` are supported. Every word is tokenized like
+    the index, so punctuation can never reach FTS5 as syntax.
+    """
+    parts, negated, depth = [], [], 0
+    for tok in _QUERY_RE.findall(query):
+        if tok in ("(", ")"):
+            depth += 1 if tok == "(" else -1
+            if depth < 0:
+                raise ValueError("Unbalanced parentheses in query")
+            parts.append(tok)
+        elif tok in _OPERATORS:
+            parts.append(tok)
+        elif tok.startswith('"'):
+            if term := _term(tok.strip('"')):
+                parts.append(term)
+        elif tok.startswith("-") and len(tok) > 1:
+            if term := _term(tok[1:].rstrip("*"), tok.endswith("*")):
+                # FTS5 NOT is binary, so top-level exclusions go after everything else.
+                (negated if depth == 0 else parts).append(term if depth == 0 else f"NOT {term}")
+        elif term := _term(tok.rstrip("*"), tok.endswith("*")):
+            parts.append(term)
+    if depth:
+        raise ValueError("Unbalanced parentheses in query")
+    while parts and parts[-1] in _OPERATORS:
+        parts.pop()
+    if not parts:
+        raise ValueError("Query has no searchable words")
+    expr = " ".join(parts)
+    if negated:
+        expr = f"({expr})" + "".join(f" NOT {t}" for t in negated)
+    return expr
+
+
+class SearchIndex:
+    def __init__(self, root, path=None):
+        self.root = Path(root)
+        self.path = Path(path) if path else self.root / INDEX_NAME
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def refresh(self):
+        """Index new and changed folders and drop deleted ones; returns (added, updated, removed)."""
+        known = {folder: (doc_id, mtime, size) for doc_id, folder, mtime, size
+                 in self._db.execute("SELECT id, folder, mtime_ns, size FROM docs")}
+        added = updated = 0
+        db = self._db
+        db.execute("BEGIN")
+        try:
+            for folder, txt, st in layout.description_files(self.root):
+                rel = os.path.relpath(folder, self.root)
+                old = known.pop(rel, None)
+                if old and old[1:] == (st.st_mtime_ns, st.st_size):
+                    continue
+                try:
+                    with open(txt, encoding="utf-8", errors="replace") as f:
+                        source, name, body = _document(os.path.basename(folder), f.read())
+                except OSError:
+                    continue
+                if old:
+                    db.execute("DELETE FROM postings WHERE rowid = ?", (old[0],))
+                    db.execute("UPDATE docs SET mtime_ns = ?, size = ?, source = ? WHERE id = ?",
+                               (st.st_mtime_ns, st.st_size, source, old[0]))
+                    doc_id = old[0]
+                    updated += 1
+                else:
+                    doc_id = db.execute("INSERT INTO docs (folder, mtime_ns, size, source) VALUES (?, ?, ?, ?)",
+                                        (rel, st.st_mtime_ns, st.st_size, source)).lastrowid
+                    added += 1
+                db.execute("INSERT INTO postings (rowid, name, body) VALUES (?, ?, ?)", (doc_id, name, body))
+            for doc_id, _, _ in known.values():
+                db.execute("DELETE FROM postings WHERE rowid = ?", (doc_id,))
+                db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return added, updated, len(known)
+
+    def search(self, query, limit=20):
+        """Return [(folder_path, score, snippet, source)], best match first."""
+        try:
+            # Rank everything, then build snippets for the LIMIT rows only.
+            rows = self._db.execute(
+                "SELECT d.folder, -top.score, snippet(postings, 1, '[', ']', '...', 12), d.source "
+                "FROM (SELECT rowid AS id, bm25(postings, 2.0, 1.0) AS score FROM postings "
+                "      WHERE postings MATCH ?1 ORDER BY score LIMIT ?2) AS top "
+                "JOIN postings ON postings.rowid = top.id AND postings MATCH ?1 "
+                "JOIN docs d ON d.id = top.id ORDER BY top.score",
+                (to_match(query), limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Bad query: {query!r} ({e})") from None
+        return [(self.root / folder, score, snippet, source) for folder, score, snippet, source in rows]
+
+    def count(self):
+        return self._db.execute("SELECT count(*) FROM docs").fetchone()[0]
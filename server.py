@@ -0,0 +1,180 @@
+"""Resident local HTTP API that turns postings into job folders.
+
+POST /jobs with one of:
+  - application/json: {"url": "...", "html": "...", "french": false}; html is optional
+  - text/html: the saved page itself, with ?url=<source> and ?vf=1 optional
+  - anything else: the posting URL as the whole body
+GET /health answers {"ok": true}.
+
+Without --token, a POST carrying an Origin other than the server's own is
+refused, so a web page can't make the browser submit postings to it.
+"""
+
+import hmac
+import json
+import threading
+import urllib.error
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import job_index
+import layout
+import processor
+import scraper
+
+MAX_REQUEST_BYTES = scraper.MAX_BODY_BYTES
+
+
+class _BadRequest(ValueError):
+    pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "job-tool"
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path == "/health":
+            self._reply(200, {"ok": True})
+        else:
+            self._reply(404, {"ok": False, "error": "Not found"})
+
+    def do_POST(self):
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path != "/jobs":
+            self._reply(404, {"ok": False, "error": "Not found"})
+            return
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get("X-Job-Token", ""), token):
+            self._reply(403, {"ok": False, "error": "Bad or missing X-Job-Token"})
+            return
+        origin = self.headers.get("Origin")
+        if not token and origin is not None and origin.rstrip("/").lower() not in self.server.origins():
+            # A plain-text POST is a CORS "simple request": any page could send one.
+            self._reply(403, {"ok": False, "error": "Cross-origin requests need the server started with --token"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_REQUEST_BYTES:
+            self._reply(413 if length > 0 else 411, {"ok": False, "error": "Body missing or too large"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            url, html, french = _parse_request(self.headers.get_content_type(), body, parts.query, self.server.french)
+            result = self.server.ingest(url, html, french)
+        except _BadRequest as e:
+            self._reply(400, {"ok": False, "error": str(e)})
+        except ValueError as e:
+            self._reply(422, {"ok": False, "error": str(e)})
+        except (urllib.error.URLError, OSError) as e:
+            self._reply(502, {"ok": False, "error": str(e) or type(e).__name__})
+        except Exception as e:
+            self._reply(500, {"ok": False, "error": str(e) or type(e).__name__})
+        else:
+            self._reply(201, result)
+
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+
+def _flag(value, name):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in _TRUE + _FALSE:
+        return value.strip().lower() in _TRUE
+    raise _BadRequest(f"{name} must be true or false")
+
+
+def _parse_request(ctype, body, query, french):
+    params = urllib.parse.parse_qs(query)
+    url = (params.get("url") or [""])[0].strip()
+    french = _flag(params["vf"][0], "vf") if "vf" in params else french
+    html = None
+    if ctype == "application/json":
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise _BadRequest("Request body is not valid JSON") from None
+        if not isinstance(data, dict):
+            raise _BadRequest("JSON request body must be an object")
+        url, html = data.get("url") or url, data.get("html")
+        if not isinstance(url, str) or not isinstance(html, (str, type(None))):
+            raise _BadRequest("url and html must be strings")
+        url = url.strip()
+        if data.get("french") is not None:
+            french = _flag(data["french"], "french")
+    elif ctype == "text/html":
+        html = scraper._decode(body)
+    else:
+        url = scraper._decode(body).strip()
+
+    if html is None and not url.lower().startswith(("http://", "https://")):
+        # Never read local paths on behalf of a network client.
+        raise _BadRequest("Send an http(s) posting URL or the page HTML")
+    return url, html, french
+
+
+class JobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, base_dir, cache=None, session=None, index=None, manifest=None, sink=None, french=False,
+                 token=None, quiet=False, fill=False):
+        super().__init__(address, _Handler)
+        self.base_dir = Path(base_dir)
+        self.cache = cache
+        self.index = index
+        # Always claim names through a manifest: two postings that map to the
+        # same folder name get Name and Name-2 instead of sharing one folder.
+        self.manifest = manifest or layout.Manifest(self.base_dir)
+        self.sink = sink
+        self.session = session or scraper.new_session()
+        self.french = french
+        self.fill = fill
+        self.token = token
+        self.quiet = quiet
+        # Fetching and parsing run concurrently; folder writes are serialized.
+        self._write_lock = threading.Lock()
+
+    def origins(self):
+        port = self.server_address[1]
+        return {f"http://{host}:{port}" for host in ("127.0.0.1", "localhost", "[::1]")}
+
+    def ingest(self, url, html=None, french=False):
+        try:
+            if html is None:
+                job = scraper.scrape_job(url, self.cache, self.session, self.index)
+            else:
+                job = scraper.extract_job(html, url)
+            with self._write_lock:
+                out = processor.process_job(job, self.base_dir, url or None, french=french, index=self.index,
+                                              manifest=self.manifest, sink=self.sink, fill=self.fill)
+        except job_index.Duplicate as e:
+            return {"ok": True, "duplicate": e.reason, "folder": e.folder}
+        return {
+            "ok": True,
+            "folder": str(out["folder_path"]),
+            "folder_name": out["folder_name"],
+            "resume_template": str(out["resume_template_path"]) if out["resume_template_path"] else None,
+        }
+
+    def server_close(self):
+        super().server_close()
+        self.session.close()
+        if self.index:
+            self.index.close()
@@ -0,0 +1,466 @@
+"""Where ``process_job`` puts a job bundle: folders, one archive, or SQLite.
+
+A bundle is a folder path (relative, ``/``-separated) plus its rendered
+text files and the resume template. ``DirSink`` is the classic layout of
+real folders. ``ZipSink`` and ``TarSink`` append every bundle to a single
+archive, and ``SQLiteSink`` stores bundles as rows with file contents
+deduplicated by hash. The last three write in batches (one central
+directory, flush or transaction per ``batch`` bundles) and leave the
+filesystem alone until ``materialize`` expands a bundle on demand. A crash
+loses at most the batch in progress; ``pending`` says how many bundles
+that is. The archive and database modules are imported only when one of
+those sinks is used.
+"""
+
+import hashlib
+import io
+import struct
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import file_ops
+import timings
+
+TEMPLATE_NAME = "resume-template.tex"
+BATCH = 500
+
+
+def _encode(data):
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+class DirSink:
+    """Real folders under BASE_DIR, one file per write (the default)."""
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+
+    @property
+    def pending(self):
+        """Bundles written but not yet committed; a crash now would lose them."""
+        return 0
+
+    def write(self, folder, files, template=None):
+        path = file_ops.ensure_job_folder(self.base_dir, folder)
+        paths = [file_ops.write_text(path, name, text) for name, text in files.items()]
+        tpl = file_ops.copy_template(template, path) if template else None
+        return path, paths, tpl
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _ArchiveSink(DirSink):
+    def __init__(self, path, batch=BATCH):
+        self.path = Path(path).resolve()
+        self.batch = batch
+        self._pending = 0
+        self._template = None
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def _location(self, folder, name=None):
+        return f"{self.path}::{folder}" + (f"/{name}" if name else "")
+
+    def _template_bytes(self, template):
+        # Same file for every bundle; read it once.
+        if self._template is None or self._template[0] != template:
+            self._template = (template, template.read_bytes() if template.exists() else None)
+        return self._template[1]
+
+    def write(self, folder, files, template=None):
+        data = {name: _encode(text) for name, text in files.items()}
+        tpl = self._template_bytes(template) if template else None
+        with timings.span("sink_write", bytes=sum(map(len, data.values()))):
+            tpl_written = self._put(folder, data, tpl)
+            self._pending += 1
+            if self._pending >= self.batch:
+                self.flush()
+        return (self._location(folder), [self._location(folder, name) for name in data],
+                self._location(folder, TEMPLATE_NAME) if tpl_written else None)
+
+    def flush(self):
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+
+
+_LOCAL = struct.Struct("<4s5H3L2H")  # local file header, up to the name
+
+
+def _scan_zip(f):
+    """ZipInfos for the complete entries of the zip in F, read from the local
+    headers alone, and the offset where the last one ends.
+
+    Used when there is no valid central directory: a crash mid-batch, or a
+    batch still being written by another process.
+    """
+    import zipfile
+
+    size = f.seek(0, 2)
+    infos, pos = [], 0
+    while pos + _LOCAL.size <= size:
+        f.seek(pos)
+        sig, _, flags, method, dtime, ddate, crc, csize, usize, nlen, xlen = _LOCAL.unpack(f.read(_LOCAL.size))
+        data_at = pos + _LOCAL.size + nlen + xlen
+        if sig != b"PK\x03\x04" or flags & 0x08 or data_at + csize > size:
+            break
+        raw = f.read(nlen)
+        name = raw.decode("utf-8" if flags & 0x800 else "cp437")
+        info = zipfile.ZipInfo(name, ((ddate >> 9) + 1980, (ddate >> 5) & 15, ddate & 31,
+                                      dtime >> 11, (dtime >> 5) & 63, (dtime & 31) * 2))
+        info.compress_type, info.flag_bits, info.CRC = method, flags, crc
+        info.compress_size, info.file_size, info.header_offset = csize, usize, pos
+        info.external_attr = 0o600 << 16
+        infos.append(info)
+        pos = data_at + csize
+    return infos, pos
+
+
+class _Scanned:
+    """Just enough of ZipFile's reading interface over entries found by _scan_zip."""
+
+    def __init__(self, f):
+        self.f = f
+        self.infos = _scan_zip(f)[0]
+
+    def infolist(self):
+        return self.infos
+
+    def namelist(self):
+        return [i.filename for i in self.infos]
+
+    def read(self, info):
+        import zipfile
+        import zlib
+
+        self.f.seek(info.header_offset + 26)
+        nlen, xlen = struct.unpack("<2H", self.f.read(4))
+        self.f.seek(nlen + xlen, 1)
+        data = self.f.read(info.compress_size)
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -15)
+        elif info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"Unsupported compression in {info.filename}")
+        if zlib.crc32(data) != info.CRC:
+            raise ValueError(f"Bad CRC for {info.filename}")
+        return data
+
+
+@contextmanager
+def _open_zip(path):
+    """Something that reads PATH like a ZipFile, even while a batch is unfinished."""
+    import zipfile
+
+    with open(path, "rb") as f:
+        try:
+            zf = zipfile.ZipFile(f)
+        except zipfile.BadZipFile:
+            yield _Scanned(f)
+            return
+        with zf:
+            yield zf
+
+
+class ZipSink(_ArchiveSink):
+    """One .zip; a rewritten file is appended again and the newest copy wins.
+
+    Each batch is written where the central directory was, then a new
+    directory listing every entry follows, so the file only grows by the
+    entries themselves. Until a batch is flushed the file has no valid
+    directory; readers then fall back to the local headers, and opening the
+    sink again after a crash keeps every complete entry and writes a
+    directory for them.
+    """
+
+    def __init__(self, path, batch=BATCH):
+        super().__init__(path, batch)
+        self._recover()
+        self._open()
+        self._names = set(self._zf.namelist())
+
+    def _recover(self):
+        import zipfile
+
+        if not self.path.exists():
+            return
+        try:
+            zipfile.ZipFile(self.path).close()
+            return
+        except zipfile.BadZipFile:
+            pass
+        with open(self.path, "r+b") as f:
+            infos, end = _scan_zip(f)
+            if not infos and end == 0 and f.seek(0, 2):
+                raise ValueError(f"{self.path} is not a zip file")
+            f.truncate(end)
+            # Not a zip yet, so ZipFile appends at the end; give it the entries found.
+            with zipfile.ZipFile(f, "a") as zf:
+                for info in infos:
+                    zf.filelist.append(info)
+                    zf.NameToInfo[info.filename] = info
+
+    def _open(self):
+        import zipfile
+
+        self._fp = open(self.path, "r+b" if self.path.exists() else "w+b")
+        # "a" writes new entries over the old central directory and a new one after them.
+        self._zf = zipfile.ZipFile(self._fp, "a", compression=zipfile.ZIP_DEFLATED)
+
+    def _close(self):
+        self._zf.close()
+        self._fp.flush()
+        self._fp.close()
+
+    def _put(self, folder, data, tpl):
+        import warnings
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # "Duplicate name" for a rewritten bundle
+            for name, blob in data.items():
+                self._zf.writestr(f"{folder}/{name}", blob)
+            tpl_name = f"{folder}/{TEMPLATE_NAME}"
+            if tpl is None or tpl_name in self._names:
+                return tpl is not None
+            self._zf.writestr(tpl_name, tpl)
+        self._names.add(tpl_name)
+        return True
+
+    def flush(self):
+        if self._pending:
+            self._close()
+            self._open()
+        super().flush()
+
+    def close(self):
+        self._pending = 0
+        self._close()
+
+
+def _tar_members(f):
+    """The complete members of the tar in F, and the offset where the last one ends.
+
+    Members cut short by a crash, and anything after them, are left out.
+    """
+    import tarfile
+
+    size = f.seek(0, 2)
+    f.seek(0)
+    try:
+        tf = tarfile.open(fileobj=f)
+    except tarfile.TarError:
+        raise ValueError(f"{getattr(f, 'name', 'file')} is not a tar file") from None
+    members, end = [], 0
+    try:
+        while (info := tf.next()) is not None and info.offset_data + info.size <= size:
+            members.append(info)
+            end = info.offset_data + -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+    except tarfile.TarError:
+        pass
+    return tf, members, min(end, size)
+
+
+@contextmanager
+def _open_tar(path):
+    """(TarFile, complete members) for reading PATH."""
+    with open(path, "rb") as f:
+        tf, members, _ = _tar_members(f)
+        yield tf, members
+
+
+class TarSink(_ArchiveSink):
+    """One uncompressed .tar, appended in place; the newest copy of a file wins.
+
+    Opening the sink again after a crash cuts off a member left half written.
+    """
+
+    def __init__(self, path, batch=BATCH):
+        import tarfile
+
+        super().__init__(path, batch)
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                _, _, end = _tar_members(f)
+                # tarfile only appends to an archive that has its end-of-archive blocks.
+                f.truncate(end)
+                f.seek(end)
+                f.write(bytes(2 * tarfile.BLOCKSIZE))
+        self._tf = tarfile.open(self.path, "a")
+        self._names = set(self._tf.getnames())
+
+    def _add(self, name, blob):
+        import tarfile
+
+        info = tarfile.TarInfo(name)
+        info.size = len(blob)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tf.addfile(info, io.BytesIO(blob))
+
+    def _put(self, folder, data, tpl):
+        for name, blob in data.items():
+            self._add(f"{folder}/{name}", blob)
+        tpl_name = f"{folder}/{TEMPLATE_NAME}"
+        if tpl is not None and tpl_name not in self._names:
+            self._add(tpl_name, tpl)
+            self._names.add(tpl_name)
+        return tpl is not None
+
+    def flush(self):
+        self._tf.fileobj.flush()
+        super().flush()
+
+    def close(self):
+        self._pending = 0
+        self._tf.close()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundles (folder TEXT PRIMARY KEY, created REAL NOT NULL, updated REAL NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (folder, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (sha256 TEXT PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID;
+"""
+
+
+class SQLiteSink(_ArchiveSink):
+    """Bundles as rows; identical contents (the template, repeated text) are stored once."""
+
+    def __init__(self, path, batch=BATCH):
+        import sqlite3
+
+        super().__init__(path, batch)
+        self._db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._in_tx = False
+
+    def _store(self, folder, name, blob, replace=True):
+        digest = hashlib.sha256(blob).hexdigest()
+        self._db.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?)", (digest, blob))
+        verb = "REPLACE" if replace else "IGNORE"
+        self._db.execute(f"INSERT OR {verb} INTO files VALUES (?, ?, ?)", (folder, name, digest))
+
+    def _put(self, folder, data, tpl):
+        if not self._in_tx:
+            self._db.execute("BEGIN")
+            self._in_tx = True
+        now = time.time()
+        self._db.execute("INSERT INTO bundles VALUES (?, ?, ?) ON CONFLICT (folder) DO UPDATE SET updated = excluded.updated",
+                         (folder, now, now))
+        for name, blob in data.items():
+            self._store(folder, name, blob)
+        if tpl is not None:
+            # Like copy_template: an existing (maybe edited) template is kept.
+            self._store(folder, TEMPLATE_NAME, tpl, replace=False)
+        return tpl is not None
+
+    def flush(self):
+        if self._in_tx:
+            self._db.execute("COMMIT")
+            self._in_tx = False
+        super().flush()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+
+_KINDS = {".zip": ZipSink, ".tar": TarSink, ".sqlite": SQLiteSink, ".sqlite3": SQLiteSink, ".db": SQLiteSink}
+
+
+def open_sink(path, batch=BATCH):
+    """The sink for an output file, chosen by its extension."""
+    kind = _KINDS.get(Path(path).suffix.lower())
+    if kind is None:
+        raise ValueError(f"Unknown sink type for {path}; use one of {', '.join(_KINDS)}")
+    return kind(path, batch)
+
+
+def _is_sqlite(path):
+    return _KINDS.get(Path(path).suffix.lower()) is SQLiteSink
+
+
+def list_bundles(path):
+    """Bundle folders in a sink file, oldest first."""
+    import sqlite3
+
+    path = Path(path)
+    if _is_sqlite(path):
+        with closing(sqlite3.connect(path)) as db:
+            return [row[0] for row in db.execute("SELECT folder FROM bundles ORDER BY created")]
+    if path.suffix.lower() == ".zip":
+        with _open_zip(path) as zf:
+            names = zf.namelist()
+    elif path.suffix.lower() == ".tar":
+        with _open_tar(path) as (_, members):
+            names = [info.name for info in members if info.isfile()]
+    else:
+        raise ValueError(f"Unknown sink type for {path}")
+    return list(dict.fromkeys(name.rpartition("/")[0] for name in names))
+
+
+def read_bundle(path, folder):
+    """{name: bytes} for one bundle; the newest copy of each file."""
+    import sqlite3
+
+    path = Path(path)
+    files = {}
+    if _is_sqlite(path):
+        with closing(sqlite3.connect(path)) as db:
+            rows = db.execute("SELECT f.name, b.data FROM files f JOIN blobs b ON b.sha256 = f.sha256 WHERE f.folder = ?",
+                              (folder,))
+            files.update(rows)
+    elif path.suffix.lower() == ".zip":
+        with _open_zip(path) as zf:
+            for info in zf.infolist():
+                if info.filename.rpartition("/")[0] == folder:
+                    files[info.filename.rpartition("/")[2]] = zf.read(info)
+    elif path.suffix.lower() == ".tar":
+        with _open_tar(path) as (tf, members):
+            for info in members:
+                if info.isfile() and info.name.rpartition("/")[0] == folder:
+                    files[info.name.rpartition("/")[2]] = tf.extractfile(info).read()
+    else:
+        raise ValueError(f"Unknown sink type for {path}")
+    return files
+
+
+def materialize(path, folder, base_dir):
+    """Write one bundle out as a real folder under BASE_DIR; returns the folder path.
+
+    FOLDER is a bundle path or any unique part of one. A template already in
+    the target folder is kept, as with a fresh ``process_job``.
+    """
+    folders = list_bundles(path)
+    if folder not in folders:
+        matches = [f for f in folders if folder.lower() in f.lower()]
+        if len(matches) != 1:
+            found = "\n  ".join(matches[:20]) if matches else "nothing"
+            raise ValueError(f"{folder!r} matches {len(matches)} bundles in {path}:\n  {found}")
+        folder = matches[0]
+    target = file_ops.ensure_job_folder(base_dir, folder)
+    for name, data in read_bundle(path, folder).items():
+        out = target / name
+        if name == TEMPLATE_NAME and out.exists():
+            continue
+        out.write_bytes(data)
+    return target
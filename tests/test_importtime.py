@@ -0,0 +1,17 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+# Loaded by path: putting benchmarks/ on sys.path would shadow sinks and others.
+_spec = importlib.util.spec_from_file_location(
+    "importtime", Path(__file__).resolve().parent.parent / "benchmarks" / "importtime.py")
+importtime = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(importtime)
+
+
+@pytest.mark.slow
+def test_routes_stay_within_their_import_budgets():
+    # IMPORTTIME_SCALE loosens the budgets on slow machines, like --scale.
+    assert importtime.check(scale=float(os.environ.get("IMPORTTIME_SCALE", "1"))) == []
@@ -0,0 +1,44 @@
+import subprocess
+
+import latex_build
+
+
+def _fake_pdflatex(calls):
+    def run(args, cwd, env=None):
+        calls.append(args)
+        jobname = next(a for a in args if a.startswith("-jobname="))[len("-jobname="):]
+        (cwd / f"{jobname}.fmt").write_bytes(b"format")
+        return subprocess.CompletedProcess(args, 0, "", "")
+    return run
+
+
+def test_format_is_dumped_again_after_a_tex_update(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(latex_build, "FORMAT_DIR", tmp_path)
+    monkeypatch.setattr(latex_build, "_run_pdflatex", _fake_pdflatex(calls))
+    monkeypatch.setattr(latex_build, "_engine", "pdftex 2025\n")
+    preamble = "\\documentclass{article}\n"
+
+    fmt = latex_build.format_for(preamble)
+    assert fmt.is_file()
+    assert latex_build.format_for(preamble) == fmt
+    assert len(calls) == 1
+
+    monkeypatch.setattr(latex_build, "_engine", "pdftex 2026\n")
+    assert latex_build.format_for(preamble) == fmt
+    assert len(calls) == 2
+    assert latex_build.format_for(preamble) == fmt
+    assert len(calls) == 2
+
+
+def test_format_from_before_the_stamp_is_dumped_again(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(latex_build, "FORMAT_DIR", tmp_path)
+    monkeypatch.setattr(latex_build, "_run_pdflatex", _fake_pdflatex(calls))
+    monkeypatch.setattr(latex_build, "_engine", "pdftex 2026\n")
+    preamble = "\\documentclass{article}\n"
+    fmt = latex_build.format_for(preamble)
+    fmt.with_suffix(".engine").unlink()
+
+    assert latex_build.format_for(preamble) == fmt
+    assert len(calls) == 2
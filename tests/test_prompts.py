@@ -0,0 +1,21 @@
+import file_ops
+import processor
+import prompt_creator
+
+JOB = {"title": "Backend Developer", "company": "Acme Corp", "description": "Build the billing API.\n\nOn call weekly."}
+
+
+def test_prompts_use_the_templates_as_written_by_default():
+    for french in (False, True):
+        files = processor.render_job(JOB, french=french)["files"]
+        assert files["prompt.txt"] == file_ops.prompt_text(prompt_creator.get_main_prompt(french), JOB["description"])
+        assert files["prompt-cover.txt"] == file_ops.prompt_text(prompt_creator.get_cover_prompt(french),
+                                                                 JOB["description"])
+        assert '"fill": false' in files[processor.JOB_FILE]
+
+
+def test_fill_puts_the_company_in_the_cover_prompt():
+    files = processor.render_job(JOB, fill=True)["files"]
+    assert "[COMPANY]" not in files["prompt-cover.txt"]
+    assert "Acme Corp’s needs" in " ".join(files["prompt-cover.txt"].split())
+    assert '"fill": true' in files[processor.JOB_FILE]
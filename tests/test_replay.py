@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+import layout
+import page_archive
+import processor
+import replay
+
+
+def _page(title):
+    posting = {"@context": "https://schema.org", "@type": "JobPosting", "title": title,
+               "hiringOrganization": {"@type": "Organization", "name": "Acme"}, "description": "Build the billing API."}
+    return f'<html><script type="application/ld+json">{json.dumps(posting)}</script></html>'.encode()
+
+
+@pytest.mark.parametrize("with_manifest", [False, True])
+def test_renamed_posting_moves_its_folder(tmp_path, with_manifest):
+    base, url = tmp_path / "jobs", "https://example.com/jobs/1"
+    manifest = layout.Manifest(base) if with_manifest else None
+    old = processor.process_job({"title": "Developer", "company": "Acme", "description": "Build the billing API."},
+                                base, url, manifest=manifest)["folder_path"]
+    (old / "Resume.pdf").write_bytes(b"%PDF")
+    archive = page_archive.PageArchive(tmp_path / "archive")
+    archive.append(url, {"Content-Type": "text/html"}, _page("Backend Developer"))
+
+    [r] = replay.run_replay(archive, base, procs=1, manifest=manifest)
+
+    assert r["status"] == "renamed"
+    assert r["previous"] == str(old)
+    assert not old.exists()
+    name = processor.make_folder_name("Backend Developer", "Acme")
+    new = base / name
+    assert r["folder"] == str(new)
+    assert sorted(p.name for p in new.iterdir()) == sorted(
+        [".job.json", f"{name}.txt", "Resume.pdf", "prompt-cover.txt", "prompt.txt",
+         "resume-template.tex"])
+    if with_manifest:
+        assert [e["folder"] for e in layout.Manifest(base).entries()] == [name]
+    assert [f for f, _, _ in layout.description_files(base)] == [str(new)]
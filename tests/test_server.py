@@ -0,0 +1,37 @@
+import json
+import threading
+import urllib.request
+
+import server
+
+
+def _page(body):
+    posting = {"@context": "https://schema.org", "@type": "JobPosting", "title": "Backend Developer",
+               "hiringOrganization": {"@type": "Organization", "name": "Acme"}, "description": body}
+    return f'<html><script type="application/ld+json">{json.dumps(posting)}</script></html>'.encode()
+
+
+def _post(port, url, html):
+    req = urllib.request.Request(f"http://127.0.0.1:{port}/jobs?url={url}", data=html,
+                                 headers={"Content-Type": "text/html"})
+    with urllib.request.urlopen(req) as resp:
+        return json.load(resp)
+
+
+def test_same_title_and_company_get_separate_folders(tmp_path):
+    httpd = server.JobServer(("127.0.0.1", 0), tmp_path, quiet=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        port = httpd.server_address[1]
+        first = _post(port, "https://example.com/jobs/1", _page("Build the billing API."))
+        second = _post(port, "https://example.com/jobs/2", _page("Run the data platform."))
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert first["folder_name"] == second["folder_name"]
+    assert first["folder"] != second["folder"]
+    texts = [(tmp_path / r["folder"]).joinpath(f"{r['folder_name']}.txt").read_text(encoding="utf-8")
+             for r in (first, second)]
+    assert "billing API" in texts[0]
+    assert "data platform" in texts[1]
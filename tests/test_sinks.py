@@ -0,0 +1,71 @@
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import sinks
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _fill(path, n, batch=1):
+    with sinks.ZipSink(path, batch=batch) as sink:
+        for i in range(n):
+            sink.write(f"Company/Job-{i}", {"description.txt": f"posting {i}\n" * 20})
+
+
+def test_zip_grows_linearly_with_flushes(tmp_path):
+    sizes = []
+    for n in (50, 100, 200):
+        path = tmp_path / f"{n}.zip"
+        _fill(path, n)
+        sizes.append(path.stat().st_size)
+        assert len(sinks.list_bundles(path)) == n
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+    # Stacked central directories would make each doubling ~4x the size.
+    assert sizes[1] / sizes[0] == pytest.approx(2, rel=0.1)
+    assert sizes[2] / sizes[1] == pytest.approx(2, rel=0.1)
+
+
+def test_zip_reopen_after_crash_keeps_complete_entries(tmp_path):
+    path = tmp_path / "out.zip"
+    _fill(path, 10)
+    # Die mid-batch: entries written over the old directory, no new one.
+    script = (f"import os, sinks\n"
+              f"sink = sinks.ZipSink({str(path)!r}, batch=100)\n"
+              f"for i in range(10, 15):\n"
+              f"    sink.write(f'Company/Job-{{i}}', {{'description.txt': f'posting {{i}}\\n'}})\n"
+              f"sink._zf.fp.flush()\n"
+              f"os._exit(0)\n")
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
+
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(path)
+    assert len(sinks.list_bundles(path)) == 15
+    assert sinks.read_bundle(path, "Company/Job-12") == {"description.txt": b"posting 12\n"}
+
+    with sinks.ZipSink(path) as sink:
+        sink.write("Company/Job-15", {"description.txt": "posting 15\n"})
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+    assert len(sinks.list_bundles(path)) == 16
+
+
+def test_sqlite_readers_close_their_connection(tmp_path, monkeypatch):
+    import sqlite3
+
+    path = tmp_path / "out.sqlite"
+    with sinks.open_sink(path) as sink:
+        sink.write("Company/Job", {"description.txt": "text"})
+    opened = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *a, **kw: opened.append(connect(*a, **kw)) or opened[-1])
+    assert sinks.list_bundles(path) == ["Company/Job"]
+    assert sinks.read_bundle(path, "Company/Job") == {"description.txt": b"text"}
+    assert len(opened) == 2
+    for db in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
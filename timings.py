@@ -0,0 +1,180 @@
+"""Opt-in span instrumentation: wall time, bytes processed and peak memory.
+
+Everything is a no-op until ``enable()`` is called; a disabled ``span()`` is
+one global lookup returning a shared null object.
+"""
+
+import functools
+import threading
+import time
+
+# Imported by enable(memory=True); it pulls in pickle and linecache.
+tracemalloc = None
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL = _NullSpan()
+_recorder = None
+
+
+class _Recorder:
+    def __init__(self, memory):
+        self.memory = memory
+        self.spans = []
+        self.t0 = time.perf_counter()
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def stack(self):
+        try:
+            return self.local.stack
+        except AttributeError:
+            self.local.stack = []
+            return self.local.stack
+
+
+class _Span:
+    __slots__ = ("rec", "name", "attrs", "start", "peak", "parent")
+
+    def __init__(self, rec, name, attrs):
+        self.rec, self.name, self.attrs = rec, name, attrs
+        self.peak = 0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = self.rec.stack()
+        self.parent = stack[-1] if stack else None
+        if self.rec.memory:
+            # Fold the peak so far into the enclosing span, then measure ours from zero.
+            if self.parent:
+                self.parent.peak = max(self.parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        rec = self.rec
+        rec.stack().pop()
+        record = {
+            "name": self.name,
+            "start_ms": round((self.start - rec.t0) * 1000, 3),
+            "ms": round((end - self.start) * 1000, 3),
+            "thread": threading.current_thread().name,
+            "parent": self.parent.name if self.parent else None,
+            **self.attrs,
+        }
+        if exc_type:
+            record["error"] = exc_type.__name__
+        if rec.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            record["peak_bytes"] = self.peak
+            if self.parent:
+                self.parent.peak = max(self.parent.peak, self.peak)
+            tracemalloc.reset_peak()
+        with rec.lock:
+            rec.spans.append(record)
+        return False
+
+
+def enable(memory=False):
+    global _recorder, tracemalloc
+    if memory:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    _recorder = _Recorder(memory)
+
+
+def disable():
+    global _recorder
+    rec, _recorder = _recorder, None
+    if rec and rec.memory:
+        tracemalloc.stop()
+    return rec.spans if rec else []
+
+
+def enabled():
+    return _recorder is not None
+
+
+def span(name, **attrs):
+    rec = _recorder
+    if rec is None:
+        return _NULL
+    return _Span(rec, name, attrs)
+
+
+def add(name, seconds, **attrs):
+    """Record an already-measured span, e.g. time summed over many small chunks."""
+    rec = _recorder
+    if rec is None:
+        return
+    stack = rec.stack()
+    record = {"name": name, "start_ms": None, "ms": round(seconds * 1000, 3),
+              "thread": threading.current_thread().name, "parent": stack[-1].name if stack else None, **attrs}
+    with rec.lock:
+        rec.spans.append(record)
+
+
+def timed(name):
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def merge(spans):
+    """Adopt spans recorded elsewhere, e.g. returned by a worker process."""
+    rec = _recorder
+    if rec is None:
+        return
+    with rec.lock:
+        rec.spans.extend(spans)
+
+
+def memory_enabled():
+    return _recorder is not None and _recorder.memory
+
+
+def write_trace(spans, path):
+    import json
+
+    with open(path, "w", encoding="utf-8") as f:
+        for s in spans:
+            f.write(json.dumps(s, default=str) + "\n")
+
+
+def summary(spans):
+    agg = {}
+    for s in spans:
+        a = agg.setdefault(s["name"], {"count": 0, "ms": 0.0, "bytes": 0, "peak_bytes": 0})
+        a["count"] += 1
+        a["ms"] += s["ms"]
+        a["bytes"] += s.get("bytes") or 0
+        a["peak_bytes"] = max(a["peak_bytes"], s.get("peak_bytes") or 0)
+
+    lines = [f"{'span':24} {'count':>6} {'total ms':>10} {'mean ms':>9} {'MB':>8} {'peak KiB':>9}"]
+    for name, a in sorted(agg.items(), key=lambda kv: -kv[1]["ms"]):
+        mb = f"{a['bytes'] / 1e6:8.2f}" if a["bytes"] else f"{'':8}"
+        peak = f"{a['peak_bytes'] / 1024:9.0f}" if a["peak_bytes"] else f"{'':9}"
+        lines.append(f"{name:24} {a['count']:6} {a['ms']:10.1f} {a['ms'] / a['count']:9.2f} {mb} {peak}")
+    return "\n".join(lines)
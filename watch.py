@@ -0,0 +1,266 @@
+"""Watch a folder for saved posting pages and link files and process each once.
+
+New ``.html``/``.htm``/``.mhtml`` pages are parsed like ``ingest``; ``.url``
+shortcuts and ``.txt`` link lists are fetched like the URL route. On Linux
+the folder is watched with inotify (through ctypes), so the loop sleeps in
+``select`` until something is written; elsewhere, or with ``poll=True``, the
+folder is rescanned every ``poll_interval`` seconds. A file is handled once
+its size and mtime have stopped changing for ``settle`` seconds, and every
+handled file is appended to a cursor so a restart never repeats it.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import ingest
+import job_index
+import processor
+import scraper
+
+CURSOR_NAME = ".watch-cursor.jsonl"
+LINK_EXTS = (".url", ".txt")
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT = struct.Struct("iIII")
+_TEMP_EXTS = (".crdownload", ".part", ".partial", ".tmp", ".download")
+
+
+class _Inotify:
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Only completed writes and renames into the folder: a browser's
+        # partial .crdownload/.part file shows up once, when it is renamed.
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        """Names written since the last call; None if the kernel queue overflowed."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        buf = os.read(self.fd, 64 * 1024)
+        names, off = [], 0
+        while off < len(buf):
+            _, mask, _, size = _EVENT.unpack_from(buf, off)
+            off += _EVENT.size
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            names.append(os.fsdecode(buf[off:off + size].rstrip(b"\0")))
+            off += size
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify(directory):
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify(directory)
+    except (OSError, AttributeError):
+        return None  # no inotify (old libc, container limits): poll instead
+
+
+def is_candidate(name):
+    lower = name.lower()
+    return not name.startswith((".", "~")) and not lower.endswith(_TEMP_EXTS) and lower.endswith(ingest.PAGE_EXTS + LINK_EXTS)
+
+
+def read_links(path):
+    """http(s) URLs in a .url shortcut (URL=...) or a .txt file (one per line)."""
+    urls = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line.upper().startswith("URL="):
+                line = line[4:].strip()
+            if line.lower().startswith(("http://", "https://")):
+                urls.append(line)
+    return urls
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def read_cursor(path):
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    done.add((rec["file"], rec["size"], rec["mtime_ns"]))
+                except (ValueError, KeyError, TypeError):
+                    continue  # a line cut short by an interrupted run
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class Watcher:
+    def __init__(self, directory, base_dir, cursor=None, french=False, workers=2, cache=None, session=None,
+                 index=None, manifest=None, sink=None, settle=0.2, poll=False, poll_interval=0.5, on_result=None,
+                 fill=False):
+        self.directory = Path(directory)
+        self.base_dir = Path(base_dir)
+        self.cursor = Path(cursor) if cursor else self.directory / CURSOR_NAME
+        self.french = french
+        self.fill = fill
+        self.workers = workers
+        self.cache, self.session, self.index, self.manifest, self.sink = cache, session, index, manifest, sink
+        self.settle = settle
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.on_result = on_result or (lambda result: None)
+        self._done = read_cursor(self.cursor)
+        self._pending = {}  # name -> (signature, time it was last seen changing)
+        self._running = set()
+        self._seen = {}  # polling only: name -> last signature
+        self._write_lock = threading.Lock()
+        self._cursor_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _note(self, name, now):
+        if not is_candidate(name) or name in self._running:
+            return
+        sig = _signature(self.directory / name)
+        if sig is None or (name, *sig) in self._done:
+            self._pending.pop(name, None)
+            return
+        old = self._pending.get(name)
+        if not old or old[0] != sig:
+            self._pending[name] = (sig, now)
+
+    def _scan(self, now):
+        try:
+            names = [e.name for e in os.scandir(self.directory) if e.is_file()]
+        except OSError:
+            return
+        for name in names:
+            self._note(name, now)
+
+    def _poll(self, now):
+        # Without inotify, only files whose signature moved since the last scan are looked at twice.
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        seen = {}
+        for e in entries:
+            if not is_candidate(e.name):
+                continue
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            seen[e.name] = sig = (st.st_size, st.st_mtime_ns)
+            if self._seen.get(e.name) != sig or e.name in self._pending:
+                self._note(e.name, now)
+        self._seen = seen
+
+    def _handle(self, name, sig):
+        path = self.directory / name
+        results = []
+        try:
+            if name.lower().endswith(ingest.PAGE_EXTS):
+                job, url = ingest.parse_source("file", str(path))
+                results.append(self._process(job, url or None, name))
+            else:
+                urls = read_links(path)
+                if not urls:
+                    raise ValueError("No http(s) URL in file")
+                for url in urls:
+                    try:
+                        job = scraper.scrape_job(url, self.cache, self.session, self.index)
+                        results.append(self._process(job, url, name))
+                    except Exception as e:
+                        results.append(self._failure(name, url, e))
+        except Exception as e:
+            results.append(self._failure(name, None, e))
+        rec = {"file": name, "size": sig[0], "mtime_ns": sig[1], "ok": all(r["ok"] for r in results),
+               "results": results}
+        with self._cursor_lock, open(self.cursor, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        for r in results:
+            self.on_result(r)
+
+    def _process(self, job, url, name):
+        # Postings can map to the same folder name, so writes go one at a time.
+        with self._write_lock:
+            out = processor.process_job(job, self.base_dir, url, french=self.french, index=self.index,
+                                        manifest=self.manifest, sink=self.sink, fill=self.fill)
+        return {"file": name, "url": url, "ok": True, "folder": str(out["folder_path"])}
+
+    def _failure(self, name, url, exc):
+        if isinstance(exc, job_index.Duplicate):
+            return {"file": name, "url": url, "ok": True, "skipped": exc.reason, "folder": exc.folder}
+        return {"file": name, "url": url, "ok": False, "error": str(exc) or type(exc).__name__}
+
+    def run(self):
+        """Process files until stop() is called; returns whether inotify was used."""
+        notify = None if self.poll else _open_inotify(self.directory)
+        self._scan(time.monotonic())  # whatever arrived while nobody was watching
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while not self._stop.is_set():
+                    now = time.monotonic()
+                    if self._pending:
+                        timeout = max(0.0, min(t for _, t in self._pending.values()) + self.settle - now)
+                    else:
+                        timeout = None  # idle: sleep until the kernel reports a write
+                    if notify:
+                        # Wake at least once a second so stop() is noticed.
+                        names = notify.wait(1.0 if timeout is None else min(timeout, 1.0))
+                        now = time.monotonic()
+                        if names is None:
+                            self._scan(now)
+                        for name in names or ():
+                            self._note(name, now)
+                    else:
+                        self._stop.wait(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+                        now = time.monotonic()
+                        self._poll(now)
+                    for name, (sig, changed) in list(self._pending.items()):
+                        if now - changed < self.settle:
+                            continue
+                        current = _signature(self.directory / name)
+                        if current != sig:
+                            # Still being written (or gone): wait for it to settle again.
+                            if current is None:
+                                del self._pending[name]
+                            else:
+                                self._pending[name] = (current, now)
+                            continue
+                        del self._pending[name]
+                        self._done.add((name, *sig))
+                        self._running.add(name)
+                        fut = pool.submit(self._handle, name, sig)
+                        fut.add_done_callback(lambda _, n=name: self._running.discard(n))
+            finally:
+                if notify:
+                    notify.close()
+        return notify is not None